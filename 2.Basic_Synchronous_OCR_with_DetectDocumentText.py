@@ -1,30 +1,5 @@
-import boto3
-import os
-from dotenv import load_dotenv
+# Basic OCR (DetectDocumentText): the extraction code lives in textract_extract/lines.py
+from textract_extract.lines import main
 
-load_dotenv()
-
-textract = boto3.client(
-    'textract',
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    region_name=os.getenv("AWS_REGION")
-)
-
-file_path = "sample.png"
-
-with open(file_path, 'rb') as document:
-    image_bytes = document.read()
-
-response = textract.detect_document_text(Document={'Bytes': image_bytes})
-
-#Extract text from image and document
-texts = []
-for item in response["Blocks"]:
-    if item["BlockType"] == "LINE":
-        texts.append(item["Text"])
-        
-with open("Output2.txt", "w", encoding="utf-8") as f:
-    f.write("\n".join(texts))
-
-print("Text extraction complete and saved to Output2.txt")
\ No newline at end of file
+if __name__ == "__main__":
+    raise SystemExit(main(file_path="sample.png", output_file="Output2.txt", output_dir="output2"))
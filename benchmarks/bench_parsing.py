@@ -0,0 +1,173 @@
+"""
+Parsing scalability benchmarks for the FORMS, invoice and TABLES parsers.
+
+Generates synthetic Textract responses at growing sizes, times each parser
+(best of --repeat runs) and measures its peak allocation with tracemalloc.
+A parser whose time grows faster than ``blocks ** --max-exponent`` is
+flagged as a superlinear scaling regression and the run exits with 1.
+
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --scales 1 2 4 8 16 32 --json bench.json
+"""
+import argparse
+import gc
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+from textract_extract.block_index import BlockIndex
+from textract_extract.block_store import BlockStore
+from textract_extract.normalize import DEFAULT_NORMALIZER
+from textract_extract.parsers import (
+    clean_value,
+    parse_invoice,
+    parse_key_values,
+    parse_table_blocks,
+    parse_tables,
+)
+from textract_extract.synthetic import generate_response
+
+DEFAULT_SCALES = [1, 2, 4, 8, 16]
+DEFAULT_MAX_EXPONENT = 1.5
+
+
+def response_for_scale(scale):
+    """
+    Scale 1 = 2 pages, 250 key-value pairs, 2 tables of 50x5 cells.
+    Everything grows linearly with ``scale``.
+    """
+    return generate_response(
+        pages=2 * scale,
+        lines_per_page=40,
+        kv_pairs=250 * scale,
+        tables=2 * scale,
+        rows=50,
+        seed=scale,
+    )
+
+
+def _clean_all_cells(blocks):
+    for block in blocks:
+        if block["BlockType"] == "WORD":
+            clean_value(block["Text"])
+
+
+# name -> (setup(blocks) -> args, function)
+BENCHMARKS = {
+    "forms.parse_key_values": (lambda blocks: (blocks,), parse_key_values),
+    "invoice.parse_invoice": (lambda blocks: (blocks,), parse_invoice),
+    "index.BlockIndex": (lambda blocks: (blocks,), BlockIndex),
+    "index.BlockStore": (lambda blocks: (blocks,), BlockStore),
+    "invoice.parse_tables": (lambda blocks: (BlockIndex(blocks),), parse_tables),
+    "invoice.clean_value": (lambda blocks: (blocks,), _clean_all_cells),
+    "tables.parse_table_blocks": (lambda blocks: (blocks,), parse_table_blocks),
+    "compact.parse_key_values": (lambda blocks: (BlockStore(blocks),), parse_key_values),
+    "compact.parse_table_blocks": (lambda blocks: (BlockStore(blocks),), parse_table_blocks),
+}
+
+
+def time_call(function, args, repeat):
+    # Like timeit, keep the cyclic GC out of the timings: its full
+    # collections scale with every live block and hide the parser's own cost.
+    # Every repeat starts with an empty value cache, or the later repeats
+    # would time lru_cache hits instead of the normalizer
+    best = math.inf
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            DEFAULT_NORMALIZER.cache_clear()
+            start = time.perf_counter()
+            function(*args)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def peak_memory(function, args):
+    DEFAULT_NORMALIZER.cache_clear()
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scaling_exponent(sizes, times):
+    """
+    Least-squares slope of log(time) against log(size): ~1.0 is linear,
+    ~2.0 is quadratic.
+    """
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def run(scales, repeat, max_exponent, only=None):
+    names = [n for n in BENCHMARKS if not only or any(o in n for o in only)]
+    results = {name: [] for name in names}
+
+    for scale in scales:
+        blocks = response_for_scale(scale)["Blocks"]
+        for name in names:
+            setup, function = BENCHMARKS[name]
+            args = setup(blocks)
+            results[name].append({
+                "scale": scale,
+                "blocks": len(blocks),
+                "seconds": time_call(function, args, repeat),
+                "peak_bytes": peak_memory(function, args),
+            })
+        del blocks
+
+    report = {}
+    for name, rows in results.items():
+        exponent = scaling_exponent([r["blocks"] for r in rows], [r["seconds"] for r in rows])
+        report[name] = {
+            "runs": rows,
+            "exponent": round(exponent, 3),
+            "superlinear": len(rows) > 1 and exponent > max_exponent,
+        }
+    return report
+
+
+def print_report(report, max_exponent):
+    for name, entry in report.items():
+        flag = "  <-- SUPERLINEAR" if entry["superlinear"] else ""
+        print(f"\n{name}  (scaling exponent {entry['exponent']:.2f}, limit {max_exponent}){flag}")
+        print(f"  {'blocks':>9}  {'ms':>10}  {'us/block':>9}  {'peak MB':>8}")
+        for r in entry["runs"]:
+            print(f"  {r['blocks']:>9}  {r['seconds'] * 1000:>10.2f}  "
+                  f"{r['seconds'] / r['blocks'] * 1e6:>9.3f}  {r['peak_bytes'] / 1e6:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT)
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.repeat, args.max_exponent, args.only)
+    print_report(report, args.max_exponent)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+    return 1 if any(entry["superlinear"] for entry in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
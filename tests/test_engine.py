@@ -0,0 +1,131 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+from textract_extract.cache import ResponseCache
+from textract_extract.engine import TextractEngine
+from textract_extract.retry import CircuitBreaker, RetryPolicy, set_retry_policy
+
+
+class ThrottlingError(Exception):
+    response = {"Error": {"Code": "ThrottlingException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}
+
+
+class FakeTextract:
+    def __init__(self, throttles=0):
+        self.calls = 0
+        self.throttles = throttles
+
+    def detect_document_text(self, Document):
+        self.calls += 1
+        if self.throttles:
+            self.throttles -= 1
+            raise ThrottlingError()
+        return {"Blocks": [{"BlockType": "LINE", "Id": str(self.calls), "Text": f"line {self.calls}"}]}
+
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    set_retry_policy(RetryPolicy(breaker=CircuitBreaker(), sleep=lambda seconds: None))
+    yield
+    set_retry_policy(None)
+
+
+def _run(textract, coroutine_factory, cache=None):
+    async def main():
+        async with TextractEngine(textract=textract, cache=cache, max_workers=2) as engine:
+            taken = []
+            bucket = engine.buckets["DetectDocumentText"]
+            acquire = bucket.acquire
+
+            async def counting_acquire(tokens=1.0):
+                taken.append(tokens)
+                await acquire(tokens)
+
+            bucket.acquire = counting_acquire
+            return await coroutine_factory(engine), len(taken)
+    return asyncio.run(main())
+
+
+def test_cache_hits_take_no_token(tmp_path):
+    textract = FakeTextract()
+    cache = ResponseCache(str(tmp_path))
+
+    async def twice(engine):
+        first = await engine.detect(b"\x89PNG not really")
+        second = await engine.detect(b"\x89PNG not really")
+        return first, second
+
+    (first, second), tokens = _run(textract, twice, cache)
+    assert first == second == ["line 1"]
+    assert textract.calls == 1 and tokens == 1
+
+
+def test_every_attempt_takes_a_token():
+    textract = FakeTextract(throttles=2)
+    lines, tokens = _run(textract, lambda engine: engine.detect(b"image bytes"))
+    assert lines == ["line 3"]
+    assert textract.calls == 3 and tokens == 3
+
+
+def test_detect_splits_multi_page_pdfs():
+    pypdf = pytest.importorskip("pypdf")
+    writer = pypdf.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    textract = FakeTextract()
+    lines, tokens = _run(textract, lambda engine: engine.detect(buffer.getvalue()))
+    assert lines == ["line 1", "line 2", "line 3"]
+    assert textract.calls == 3 and tokens == 3
+
+
+def _in_thread(target, timeout=10):
+    # A deadlocked loop cannot time itself out, so watch it from outside
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = target()
+        except BaseException as e:
+            outcome["error"] = e
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "engine deadlocked"
+    return outcome
+
+
+def test_leaving_the_context_with_calls_in_flight_does_not_deadlock():
+    textract = FakeTextract()
+
+    async def main():
+        async with TextractEngine(textract=textract, rates={"DetectDocumentText": 1}, max_workers=4) as engine:
+            for n in range(4):
+                asyncio.ensure_future(engine.detect(b"image %d" % n))
+            await asyncio.sleep(0.2)
+            raise KeyError("body failed")
+
+    outcome = _in_thread(lambda: asyncio.run(main()))
+    assert isinstance(outcome.get("error"), KeyError)
+    assert textract.calls == 1   # The burst token; the waiters gave up instead of calling
+
+
+def test_engine_can_be_reused_across_event_loops():
+    textract = FakeTextract()
+    engine = TextractEngine(textract=textract, rates={"DetectDocumentText": 20}, burst={"DetectDocumentText": 1})
+
+    async def batch():
+        # Three callers for one token: the third has to wait on the bucket lock
+        return await asyncio.gather(*(engine.detect(b"page %d" % n) for n in range(3)))
+
+    try:
+        outcome = _in_thread(lambda: [asyncio.run(batch()) for _ in range(2)])
+    finally:
+        engine.close()
+    assert "error" not in outcome, outcome.get("error")
+    assert textract.calls == 6
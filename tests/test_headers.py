@@ -0,0 +1,105 @@
+import pytest
+
+from textract_extract.headers import HeaderNormalizer, snake_case
+from textract_extract.parsers import iter_expense_line_items, iter_table_blocks, parse_invoice
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return HeaderNormalizer()
+
+
+@pytest.mark.parametrize("header, field", [
+    # README examples
+    ("Total Price", "line_total"),
+    ("Unit Price", "unit_price"),
+    ("Descr.", "description"),
+    ("Quantlty", "quantity"),
+    ("Ship Date", "ship_date"),
+    # Units of measure are not prices
+    ("Unit", "unit"),
+    ("UOM", "unit"),
+    ("U/M", "unit"),
+    ("Unit of Measure", "unit"),
+    ("Price/Unit", "unit_price"),
+    ("Price per Unit", "unit_price"),
+    # Tax codes are not item codes
+    ("Tax Code", "tax_code"),
+    ("VAT Code", "tax_code"),
+    ("Tax", "tax"),
+    ("Item Code", "item_code"),
+    ("Item #", "item_code"),
+    ("Code", "item_code"),
+    ("Qty", "quantity"),
+    ("Amount", "line_total"),
+])
+def test_header_synonyms(normalizer, header, field):
+    assert normalizer.field(header) == field
+
+
+def test_snake_case():
+    assert snake_case("Ship Date") == "ship_date"
+    assert snake_case("Unit-Price (USD)") == "unit_price_usd"
+
+
+def test_unique_fields_keep_the_first_column_of_a_field(normalizer):
+    headers = ["Item Code", "Code", "Description", "Description", "Qty"]
+    assert normalizer.unique_fields(headers) == ["item_code", "code", "description", "description_4", "quantity"]
+
+
+def test_custom_synonyms_are_tried_first(tmp_path):
+    path = tmp_path / "synonyms.json"
+    path.write_text('{"quantity": ["menge"], "po_number": ["po"]}', encoding="utf-8")
+    normalizer = HeaderNormalizer.from_file(str(path))
+    assert normalizer.field("Menge") == "quantity"
+    assert normalizer.field("PO") == "po_number"
+    assert normalizer.field("Unit Price") == "unit_price"
+
+
+# --- Colliding Columns in Parsed Tables ---
+def _table_blocks(rows):
+    blocks = [{"BlockType": "TABLE", "Id": "t", "Relationships": [{"Type": "CHILD", "Ids": []}]}]
+    cell_ids = blocks[0]["Relationships"][0]["Ids"]
+    for r, row in enumerate(rows, start=1):
+        for c, text in enumerate(row, start=1):
+            cell_id, word_id = f"c{r}-{c}", f"w{r}-{c}"
+            cell_ids.append(cell_id)
+            blocks.append({"BlockType": "CELL", "Id": cell_id, "RowIndex": r, "ColumnIndex": c,
+                           "Relationships": [{"Type": "CHILD", "Ids": [word_id]}]})
+            blocks.append({"BlockType": "WORD", "Id": word_id, "Text": text, "Confidence": 99.0})
+    return blocks
+
+
+def test_line_items_keep_both_columns_of_a_field():
+    blocks = _table_blocks([
+        ["Item Code", "Description", "Qty", "UOM", "Unit Price", "Tax Code", "Code"],
+        ["A-100", "Widget", "2", "EA", "10.00", "S1", "X9"],
+    ])
+    [item] = parse_invoice(blocks)["line_items"]
+    assert item["item_code"] == "A-100"
+    assert item["code"] == "X9"
+    assert item["unit"] == "EA"
+    assert item["unit_price"] == 10
+    assert item["tax_code"] == "S1"
+
+
+def test_table_columns_get_unique_fields():
+    blocks = _table_blocks([["Code", "Item Code", "Price"], ["1", "2", "3"]])
+    [table] = iter_table_blocks(blocks)
+    assert [column["Field"] for column in table["Columns"]] == ["item_code", "item_code_2", "unit_price"]
+
+
+def test_expense_line_item_keeps_the_first_field_of_a_name():
+    def field(kind, value, label=None):
+        entry = {"Type": {"Text": kind}, "ValueDetection": {"Text": value}}
+        if label:
+            entry["LabelDetection"] = {"Text": label}
+        return entry
+
+    response = {"ExpenseDocuments": [{"LineItemGroups": [{"LineItems": [{"LineItemExpenseFields": [
+        field("PRODUCT_CODE", "A-100", "Item Code"),
+        field("OTHER", "S1", "Tax Code"),
+        field("OTHER", "X9", "Code"),
+    ]}]}]}]}
+    [item] = iter_expense_line_items(response)
+    assert item == {"item_code": "A-100", "tax_code": "S1", "code": "X9"}
@@ -0,0 +1,20 @@
+from textract_extract.block_index import BlockIndex
+from textract_extract.invoice import extract_invoice, iter_line_items, main
+from textract_extract.synthetic import generate_expense_response, generate_response
+
+
+def test_fetched_input_is_parsed_by_its_own_type_in_expense_mode(monkeypatch):
+    monkeypatch.setenv("TEXTRACT_INVOICE_MODE", "expense")
+    response = generate_response(kv_pairs=6, tables=1, rows=4)
+    index = BlockIndex(response["Blocks"])
+
+    # No client is given: any attempt to call Textract would fail
+    assert extract_invoice(index) == extract_invoice(response)
+    assert len(list(iter_line_items(index))) == 3   # Row 1 is the header row
+    assert extract_invoice(generate_expense_response(line_items=3))["line_items"]
+
+
+def test_main_exits_non_zero_when_a_document_fails(tmp_path, capsys):
+    missing = str(tmp_path / "missing.png")
+    assert main([missing]) == 1
+    assert "File not found" in capsys.readouterr().out
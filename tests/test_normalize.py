@@ -0,0 +1,93 @@
+import datetime
+
+import pytest
+
+from textract_extract.normalize import DEFAULT_NORMALIZER, ValueNormalizer, parse_amount, parse_date
+
+# The "Value cleaning" table in README.md, plus the edge cases around it
+INFERRED = [
+    ("$1,234.56", 1234.56),
+    ("2.00", 2),
+    ("(45.00)", -45),
+    ("45.00-", -45),
+    ("BDT 500", 500),
+    ("1.234,56", 1234.56),
+    ("1 234,56", 1234.56),
+    ("12,5", 12.5),
+    ("1,234", 1234),
+    ("1,23", 1.23),          # A lone comma that does not group thousands is a decimal comma
+    ("5.", 5),               # Trailing decimal point: a whole number, as before
+    ("5,", 5),
+    (".5", 0.5),
+    ("-$45", -45),
+    ("1.234.567", 1234567),  # Repeated dots group thousands
+    ("12,34,567", 1234567),  # Indian grouping
+    ("12345678901234567890", 12345678901234567890),
+    ("  42  ", 42),
+    ("", ""),
+]
+TEXT = ["50%", "1e5", "nan", "Item 1", "1.2.", "5..", ".", "01.02.2019", "(45.00", "Each"]
+
+
+@pytest.mark.parametrize("text, value", INFERRED)
+def test_inferred_decimal_separator(text, value):
+    cleaned = DEFAULT_NORMALIZER.clean(text)
+    assert cleaned == value and type(cleaned) is type(value)
+
+
+@pytest.mark.parametrize("text", TEXT)
+def test_non_amounts_stay_stripped_text(text):
+    assert DEFAULT_NORMALIZER.clean(f" {text} ") == text
+    assert parse_amount(text) is None
+
+
+@pytest.mark.parametrize("text, value", [
+    ("1.234", 1234),
+    ("1,5", 1.5),
+    ("1.234,56", 1234.56),
+    ("€ 12,00", 12),
+])
+def test_forced_decimal_comma(text, value):
+    assert ValueNormalizer(decimal=",").clean(text) == value
+
+
+def test_clean_column_matches_clean():
+    values = ["12", "$1,234.56", "", "-3.50", "5.", "1,23", "Item 1", None, "(45.00)"]
+    assert DEFAULT_NORMALIZER.clean_column(values) == [DEFAULT_NORMALIZER.clean(value) for value in values]
+    plain = ["12", "$1,234.56", "", "-3.50"]
+    assert DEFAULT_NORMALIZER.clean_column(plain) == [12, 1234.56, "", -3.5]
+
+
+def test_invalid_decimal_separator_is_rejected():
+    with pytest.raises(ValueError):
+        ValueNormalizer(decimal=";")
+
+
+@pytest.mark.parametrize("text, dayfirst, date", [
+    ("2023-10-26", False, datetime.date(2023, 10, 26)),
+    ("10/26/2023", False, datetime.date(2023, 10, 26)),
+    ("01/02/2019", False, datetime.date(2019, 1, 2)),
+    ("01/02/2019", True, datetime.date(2019, 2, 1)),
+    ("26.10.2023", False, datetime.date(2023, 10, 26)),
+    ("01.02.2019", False, datetime.date(2019, 2, 1)),
+    ("Oct 26, 2023", False, datetime.date(2023, 10, 26)),
+    ("26 October 2023", False, datetime.date(2023, 10, 26)),
+    ("31/02/2023", True, None),
+])
+def test_parse_date(text, dayfirst, date):
+    assert parse_date(text, dayfirst) == date
+
+
+def test_dates_become_iso_strings_when_enabled():
+    european = ValueNormalizer(decimal=",", dayfirst=True, parse_dates=True)
+    assert european.clean("01.02.2019") == "2019-02-01"
+    assert DEFAULT_NORMALIZER.clean("01.02.2019") == "01.02.2019"
+
+
+def test_cache_clear_empties_the_value_cache():
+    normalizer = ValueNormalizer()
+    normalizer.clean("$1,234.56")
+    normalizer.clean("$1,234.56")
+    assert normalizer.cache_info().hits == 1
+    normalizer.cache_clear()
+    assert normalizer.cache_info().currsize == 0
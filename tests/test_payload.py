@@ -0,0 +1,69 @@
+import io
+import os
+import struct
+
+import pytest
+
+from textract_extract.cache import ResponseCache, make_cache_key
+from textract_extract.documents import get_response
+from textract_extract.payload import fit_payload
+
+Image = pytest.importorskip("PIL.Image")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _noise(width, height):
+    return Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+
+
+def test_repo_sample_pngs_are_sent_unchanged():
+    for name in ("form.png", "table.png", "sample.png"):
+        with open(os.path.join(ROOT, name), "rb") as f:
+            data = f.read()
+        payload = fit_payload(data)
+        assert payload.data is data and payload.actions == []
+
+
+@pytest.mark.parametrize("width, height", [(0, 100), (100, 0), (0, 0)])
+def test_malformed_png_header_with_a_zero_dimension_is_passed_through(width, height):
+    data = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + struct.pack(">II", width, height) + b"\x00" * 64
+    payload = fit_payload(data)
+    assert payload.data is data and payload.actions == []
+
+
+def test_oversized_image_is_turned_upright_before_downscaling():
+    exif = Image.Exif()
+    exif[0x0112] = 6   # Rotate 90 CW to display
+    buffer = io.BytesIO()
+    _noise(3000, 400).save(buffer, "JPEG", quality=80, exif=exif.tobytes())
+
+    payload = fit_payload(buffer.getvalue(), max_dimension=2000)
+    assert (payload.width, payload.height) == (267, 2000)
+    assert Image.open(io.BytesIO(payload.data)).size == (267, 2000)
+
+
+def test_cache_is_keyed_on_original_bytes_and_hits_skip_fitting(tmp_path, monkeypatch):
+    buffer = io.BytesIO()
+    _noise(2400, 300).save(buffer, "JPEG", quality=95)
+    original = buffer.getvalue()
+    sent = []
+
+    def analyze_document(Document, **params):
+        sent.append(Document["Bytes"])
+        return {"Blocks": []}
+
+    class Client:
+        pass
+
+    client = Client()
+    client.analyze_document = analyze_document
+    cache = ResponseCache(str(tmp_path))
+    monkeypatch.setattr("textract_extract.documents.fit_payload",
+                        lambda data: fit_payload(data, max_dimension=2000))
+
+    get_response(original, "AnalyzeDocument", client, cache, FeatureTypes=["TABLES"])
+    get_response(original, "AnalyzeDocument", client, cache, FeatureTypes=["TABLES"])
+
+    assert len(sent) == 1 and sent[0] != original   # fitted once, on the miss
+    assert cache.get(make_cache_key(original, "AnalyzeDocument", FeatureTypes=["TABLES"])) is not None
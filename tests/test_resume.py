@@ -0,0 +1,141 @@
+import json
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from textract_extract.jsonl import JsonLinesWriter
+from textract_extract.resume import BloomFilter, RunManifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for name in ("a.png", "b.png", "c.png"):
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 100)
+        paths.append(str(path))
+    return paths
+
+
+def _done_rows(manifest_path):
+    db = sqlite3.connect(manifest_path)
+    try:
+        return [row[0] for row in db.execute("SELECT path FROM inputs WHERE status = 'done'")]
+    finally:
+        db.close()
+
+
+# --- Bloom Filter ---
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    keys = [f"forms\0/data/{i}.png" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    # ~1% false positives at capacity; allow generous slack
+    assert sum(f"tables\0/other/{i}.png" in bloom for i in range(1000)) < 50
+
+
+# --- Skip Rule ---
+def test_done_inputs_are_skipped_until_they_change(tmp_path, documents):
+    manifest_path = str(tmp_path / "run.sqlite")
+    with RunManifest(manifest_path) as run_manifest:
+        for path in documents:
+            run_manifest.record(path, "forms", "out.jsonl")
+
+    a, b, c = documents
+    stat = os.stat(b)
+    os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))   # touched, same content
+    with open(c, "ab") as f:
+        f.write(b"changed")
+
+    with RunManifest(manifest_path) as run_manifest:
+        assert run_manifest.is_done(a, "forms")
+        assert run_manifest.is_done(b, "forms")
+        assert not run_manifest.is_done(c, "forms")
+        assert not run_manifest.is_done(a, "tables")   # another operation on the same file
+        jobs = [(path, "forms") for path in documents]
+        assert list(run_manifest.pending(jobs)) == [(c, "forms")]
+        assert run_manifest.skipped == 2
+
+
+def test_failed_and_missing_inputs_run_again(tmp_path, documents):
+    manifest_path = str(tmp_path / "run.sqlite")
+    missing = str(tmp_path / "missing.png")
+    with RunManifest(manifest_path) as run_manifest:
+        run_manifest.record(documents[0], "forms", "out.jsonl", error=RuntimeError("throttled"))
+        run_manifest.record(missing, "forms", "out.jsonl", error=FileNotFoundError(missing))
+        run_manifest.record(documents[1], "forms", "out.jsonl")
+    os.remove(documents[1])
+
+    with RunManifest(manifest_path) as run_manifest:
+        assert not run_manifest.is_done(documents[0], "forms")
+        assert not run_manifest.is_done(missing, "forms")
+        assert not run_manifest.is_done(documents[1], "forms")
+        assert run_manifest.summary() == {"failed": 2, "done": 1}
+
+
+# --- Durability ---
+def test_done_rows_wait_for_the_writer_fsync(tmp_path, documents):
+    manifest_path = str(tmp_path / "run.sqlite")
+    writer = JsonLinesWriter(str(tmp_path / "out.jsonl"), fsync_every=2)
+    run_manifest = RunManifest(manifest_path)
+    run_manifest.follow(writer)
+
+    writer.write({"document": documents[0]})
+    run_manifest.record(documents[0], "forms", writer.path)
+    assert _done_rows(manifest_path) == []
+    assert not run_manifest.is_done(documents[0], "forms")
+
+    writer.write({"document": documents[1]})   # Second record: the writer syncs...
+    run_manifest.record(documents[1], "forms", writer.path)
+    assert _done_rows(manifest_path) == [documents[0]]   # ...covering only rows recorded before it
+
+    run_manifest.close()   # Flushes the writer, then commits the rest
+    assert sorted(_done_rows(manifest_path)) == documents[:2]
+    writer.close()
+
+
+_KILLED_RUN = textwrap.dedent("""
+    import os, signal, sys
+    from textract_extract import cli
+    from textract_extract.jsonl import JsonLinesWriter
+    from textract_extract.resume import RunManifest
+
+    output, manifest_path, fsync_every, *paths = sys.argv[1:]
+    cli.OPERATIONS["fake"] = lambda doc, textract, cache: {"size": os.path.getsize(doc)}
+    writer = JsonLinesWriter(output, fsync_every=int(fsync_every))
+    run_manifest = RunManifest(manifest_path)
+    run_manifest.follow(writer)
+    cli.run_jobs([(path, "fake") for path in paths], writer, max_workers=2, textract=object(),
+                 run_manifest=run_manifest)
+    os.kill(os.getpid(), signal.SIGKILL)
+""")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+@pytest.mark.parametrize("fsync_every", [100, 2])
+def test_killed_run_never_records_an_unwritten_document(tmp_path, documents, fsync_every):
+    output = str(tmp_path / "k.jsonl")
+    manifest_path = str(tmp_path / "run.sqlite")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.getenv("PYTHONPATH")])))
+    completed = subprocess.run([sys.executable, "-c", _KILLED_RUN, output, manifest_path, str(fsync_every),
+                                *documents], env=env, capture_output=True)
+    assert completed.returncode == -signal.SIGKILL, completed.stderr.decode()
+
+    written = set()
+    if os.path.exists(output):
+        with open(output, encoding="utf-8") as f:
+            written = {json.loads(line)["document"] for line in f}
+    done = _done_rows(manifest_path)
+    assert set(done) <= written
+    if fsync_every == 2:
+        # The sync at the second record covers the first row; the second waits for the next sync
+        assert done == documents[:1]
@@ -0,0 +1,182 @@
+import pytest
+
+from textract_extract.retry import (
+    CLIENT, NETWORK, SERVER, THROTTLE, CircuitBreaker, RetryBudget, RetryPolicy, classify_error,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Blocked(Exception):
+    """Raised by a sleep that would otherwise wait forever."""
+
+
+class ApiError(Exception):
+    def __init__(self, code, status=400):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+
+
+def _breaker(clock, **kwargs):
+    kwargs = {"window": 10, "min_calls": 4, "threshold": 0.5, "cooldown": 5.0, **kwargs}
+    return CircuitBreaker(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _open(breaker):
+    tokens = [breaker.acquire() for _ in range(4)]
+    for token in tokens:
+        breaker.record(True, token)
+    assert breaker.state == CircuitBreaker.OPEN
+    return tokens
+
+
+def _no_wait(seconds):
+    raise Blocked
+
+
+# --- Error Classification ---
+@pytest.mark.parametrize("error, kind", [
+    (ApiError("ThrottlingException"), THROTTLE),
+    (ApiError("Anything", status=429), THROTTLE),
+    (ApiError("InternalServerError", status=500), SERVER),
+    (ApiError("InvalidParameterException"), CLIENT),
+    (ConnectionError(), NETWORK),
+    (ValueError(), CLIENT),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+# --- Circuit Breaker State Machine ---
+def test_breaker_opens_at_the_failure_threshold_after_min_calls():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for failed in (True, True, False):
+        breaker.record(failed, breaker.acquire())
+    assert breaker.state == CircuitBreaker.CLOSED   # under min_calls
+    breaker.record(False, breaker.acquire())
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opened == 1
+
+
+def test_open_breaker_waits_for_the_cooldown_then_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _open(breaker)
+    probe = breaker.acquire()
+    assert clock.now == pytest.approx(5.0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker._sleep = _no_wait
+    with pytest.raises(Blocked):
+        breaker.acquire()   # A second caller waits for the probe
+
+    breaker.record(False, probe)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.acquire() is not None
+
+
+def test_failed_probe_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _open(breaker)
+    breaker.record(True, breaker.acquire())
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opened == 2
+
+
+def test_calls_in_flight_before_opening_cannot_decide_the_probe():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    stale = breaker.acquire()   # Still in flight while the breaker opens
+    _open(breaker)
+
+    breaker.record(False, stale)
+    assert breaker.state == CircuitBreaker.OPEN
+    probe = breaker.acquire()
+    breaker.record(False, stale)
+    breaker.record(True, stale)
+    breaker.record(False)   # No token: not the probe either
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.record(True, probe)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_stale_outcomes_do_not_count_after_closing():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    stale = _open(breaker)
+    breaker.record(False, breaker.acquire())
+    assert breaker.state == CircuitBreaker.CLOSED
+    for token in stale:
+        breaker.record(True, token)
+    assert breaker._failures == 0 and breaker.state == CircuitBreaker.CLOSED
+
+
+def test_interrupted_probe_frees_the_slot():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _open(breaker)
+    policy = RetryPolicy(breaker=breaker, sleep=clock.sleep)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        policy.call(interrupted)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker._sleep = _no_wait
+    assert policy.call(lambda: "ok") == "ok"   # The next caller probes at once
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+# --- Retry Policy ---
+def test_throttles_are_retried_until_success():
+    clock = FakeClock()
+    outcomes = [ApiError("ThrottlingException"), ApiError("ThrottlingException"), "ok"]
+
+    def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    policy = RetryPolicy(breaker=_breaker(clock), sleep=clock.sleep, seed=1)
+    assert policy.call(call) == "ok"
+    assert policy.stats["retries"] == 2 and policy.stats[THROTTLE] == 2
+    assert clock.now >= 2 * 0.5   # Throttles back off from a 0.5 s base
+
+
+def test_client_errors_are_raised_at_once():
+    clock = FakeClock()
+    policy = RetryPolicy(breaker=_breaker(clock), sleep=clock.sleep)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ApiError("InvalidParameterException")
+
+    with pytest.raises(ApiError):
+        policy.call(call)
+    assert len(calls) == 1 and policy.stats["retries"] == 0
+
+
+def test_empty_retry_budget_stops_retries():
+    clock = FakeClock()
+    policy = RetryPolicy(budget=RetryBudget(ratio=0.0, reserve=0), breaker=_breaker(clock), sleep=clock.sleep)
+
+    def call():
+        raise ApiError("ServiceUnavailable", status=503)
+
+    with pytest.raises(ApiError):
+        policy.call(call)
+    assert policy.stats["budget_exhausted"] == 1 and policy.stats["retries"] == 0
@@ -0,0 +1,53 @@
+import http.client
+import json
+
+import pytest
+
+from textract_extract.server import ExtractionService, start_server
+
+
+class FakeTextract:
+    def detect_document_text(self, Document):
+        return {"Blocks": [{"BlockType": "LINE", "Id": "1", "Text": "hello", "Page": 1}]}
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = ExtractionService(max_workers=1, queue_size=1, textract=FakeTextract())
+    server = start_server(service)
+    yield server
+    server.shutdown()
+    service.close()
+
+
+def _post(server, path, headers, body=b""):
+    # Raw request, so the headers are sent exactly as given
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        connection.putrequest("POST", path, skip_accept_encoding=True)
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("path", ["/lines", "/unknown"])
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5", ""])
+def test_malformed_content_length_gets_a_400(server, path, length):
+    status, body = _post(server, path, {"Content-Length": length})
+    assert status == (404 if path == "/unknown" else 400)
+    assert "error" in body
+
+
+def test_missing_content_length_gets_a_411(server):
+    assert _post(server, "/lines", {})[0] == 411
+
+
+def test_valid_upload_is_extracted(server):
+    body = b"\x89PNG\r\n\x1a\n not a real image"
+    status, lines = _post(server, "/lines", {"Content-Length": str(len(body))}, body)
+    assert status == 200
+    assert [line["Text"] for line in lines] == ["hello"]
@@ -0,0 +1,28 @@
+"""
+Shared helpers for the Amazon Textract extraction scripts.
+
+The lazy generator APIs are importable from the package root:
+
+    from textract_extract import iter_lines, iter_key_values, iter_tables, iter_line_items
+
+Importing the package does not load boto3, read .env or build a client;
+that happens on the first call that needs Textract.
+"""
+import importlib
+
+_LAZY_EXPORTS = {
+    "iter_lines": "textract_extract.lines",
+    "iter_key_values": "textract_extract.forms",
+    "iter_tables": "textract_extract.tables",
+    "iter_line_items": "textract_extract.invoice",
+    "get_textract_client": "textract_extract.client",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'textract_extract' has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
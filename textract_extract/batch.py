@@ -0,0 +1,171 @@
+import glob
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from textract_extract.client import get_textract_client
+from textract_extract.lines import iter_lines
+from textract_extract.metrics import METRICS
+
+SUPPORTED_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff")
+DEFAULT_WORKERS = 8
+
+
+# --- Input Collection ---
+def collect_inputs(source):
+    """
+    Expands a directory, glob pattern or manifest file into a sorted,
+    de-duplicated list of document paths.
+
+    A manifest is a text file with one path per line; blank lines and
+    lines starting with '#' are ignored. Relative paths are resolved
+    against the manifest's own directory.
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.lower().endswith(SUPPORTED_EXTENSIONS)
+        ]
+        return sorted(paths)
+
+    if os.path.isfile(source):
+        if source.lower().endswith(SUPPORTED_EXTENSIONS):
+            return [source]
+        base_dir = os.path.dirname(source)
+        paths = []
+        with open(source, "r", encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+        # Keep manifest order, drop repeats
+        return list(dict.fromkeys(paths))
+
+    paths = [p for p in glob.glob(source, recursive=True) if os.path.isfile(p)]
+    if not paths:
+        raise FileNotFoundError(f"No input files match '{source}'")
+    return sorted(paths)
+
+
+def plan_outputs(paths, output_dir, extension=".txt"):
+    """
+    Assigns one output file per input, deterministically.
+    Inputs that share a file name get their position appended.
+    """
+    outputs = []
+    used = set()
+    for idx, path in enumerate(paths, start=1):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = stem + extension
+        if name in used:
+            name = f"{stem}_{idx}{extension}"
+        used.add(name)
+        outputs.append(os.path.join(output_dir, name))
+    return outputs
+
+
+# --- DetectDocumentText for One File ---
+def detect_lines(file_path, textract=None):
+    """
+    Runs DetectDocumentText on a local file and returns its LINE texts.
+    Multi-page PDFs are split and sent page by page (the batch pool already
+    keeps the API busy, so pages are not fanned out again here).
+    """
+    textract = textract or get_textract_client()
+    return [line["Text"] for line in iter_lines(file_path, textract, max_workers=1)]
+
+
+def _process_one(file_path, output_path, textract):
+    lines = detect_lines(file_path, textract)
+    if output_path is not None:
+        with METRICS.stage("write"), open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+    return lines
+
+
+# --- Concurrent Batch Runner ---
+def iter_in_order(function, items, max_workers=DEFAULT_WORKERS):
+    """
+    Runs ``function(item)`` for every item on a bounded thread pool and
+    yields ``(item, result, error)`` in input order, even when calls finish
+    out of order. At most ``2 * max_workers`` calls are in flight at once,
+    so huge inputs never queue up in memory. A failing item does not stop
+    the others; its exception is returned as ``error``.
+    """
+    window = max(1, 2 * max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= window:
+                yield _collect(*pending.popleft())
+            pending.append((item, executor.submit(function, item)))
+        while pending:
+            yield _collect(*pending.popleft())
+
+
+def _collect(item, future):
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
+
+
+def iter_detect_batch(paths, output_dir=None, max_workers=DEFAULT_WORKERS, textract=None, run_manifest=None):
+    """
+    Runs DetectDocumentText over many files on a bounded thread pool.
+
+    Results are yielded in input order as ``(path, output_path, lines,
+    error)``. With an ``output_dir`` each input's lines are also written to
+    its own .txt file (otherwise output_path is None). Inputs a RunManifest
+    records as done are skipped (and not yielded).
+    """
+    textract = textract or get_textract_client()
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        outputs = plan_outputs(paths, output_dir)
+    else:
+        outputs = [None] * len(paths)
+
+    def process(job):
+        return _process_one(job[0], job[1], textract)
+
+    # Outputs are planned over every input first, so skipping some never renames the others
+    jobs = zip(paths, outputs)
+    if run_manifest is not None:
+        jobs = (job for job in jobs if not run_manifest.is_done(job[0], "lines"))
+
+    for (path, output_path), lines, error in iter_in_order(process, jobs, max_workers):
+        yield path, output_path, lines if error is None else [], error
+
+
+def run_detect_batch(source, output_dir, max_workers=DEFAULT_WORKERS, writer=None, run_manifest=None):
+    """
+    Batch entry point used by scripts 1 and 2: prints one status line per
+    input (in input order) and returns the number of failed files.
+    With a JsonLinesWriter, each document becomes one {'document', 'lines'}
+    record instead of a .txt file. With a RunManifest, files it records as
+    done are skipped and every outcome is recorded in it.
+    """
+    paths = collect_inputs(source)
+    destination = writer.path if writer is not None else output_dir
+    failed = processed = 0
+    results = iter_detect_batch(paths, None if writer is not None else output_dir, max_workers,
+                                run_manifest=run_manifest)
+    for path, output_path, lines, error in results:
+        processed += 1
+        if error is None:
+            if writer is not None:
+                writer.write({"document": path, "lines": lines})
+            print(f"{path} -> {output_path or writer.path} ({len(lines)} lines)")
+        else:
+            failed += 1
+            print(f"{path} -> FAILED: {error}")
+        if run_manifest is not None:
+            run_manifest.record(path, "lines", output_path or destination, error)
+
+    skipped = len(paths) - processed
+    print(f"Batch complete: {len(paths) - failed}/{len(paths)} files saved to {destination}"
+          + (f" ({skipped} already done)" if skipped else ""))
+    return failed
@@ -0,0 +1,122 @@
+import os
+from collections import defaultdict
+
+from textract_extract.metrics import METRICS
+
+# Child block types whose Text makes up a KEY / VALUE / CELL's text
+WORD_TYPES = ("WORD", "SELECTION_ELEMENT")
+
+
+class BlockIndex:
+    """
+    One-pass index over a response's Blocks, shared by every parser.
+
+    Built with a single scan of the list, it holds:
+      - ``by_id``:     Id -> block
+      - ``by_type``:   BlockType -> blocks, in response order
+      - ``children``:  Id -> CHILD Ids (parent -> children adjacency)
+      - ``value_ids``: KEY Id -> VALUE Ids (key -> value adjacency)
+      - ``answer_ids``: QUERY Id -> QUERY_RESULT Ids (query -> answers)
+      - ``keys``:      KEY_VALUE_SET blocks with the KEY entity type
+    Child word lists are resolved on first use and then memoized.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.by_id = by_id = {}
+        self.by_type = by_type = defaultdict(list)
+        self.children = children = {}
+        self.value_ids = value_ids = {}
+        self.answer_ids = answer_ids = {}
+        self.keys = keys = []
+        self._words = {}
+
+        for block in blocks:
+            block_id = block["Id"]
+            by_id[block_id] = block
+            block_type = block["BlockType"]
+            by_type[block_type].append(block)
+
+            if block_type == "KEY_VALUE_SET" and "KEY" in block.get("EntityTypes", ()):
+                keys.append(block)
+
+            for rel in block.get("Relationships", ()):
+                rel_type = rel["Type"]
+                if rel_type == "CHILD":
+                    if block_id in children:
+                        children[block_id] = children[block_id] + rel["Ids"]
+                    else:
+                        children[block_id] = rel["Ids"]
+                elif rel_type == "VALUE":
+                    value_ids[block_id] = value_ids.get(block_id, []) + rel["Ids"]
+                elif rel_type == "ANSWER":
+                    answer_ids[block_id] = answer_ids.get(block_id, []) + rel["Ids"]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def of_type(self, block_type):
+        """
+        Returns every block of ``block_type`` in response order.
+        """
+        return self.by_type.get(block_type, [])
+
+    def child_blocks(self, block_id):
+        by_id = self.by_id
+        return [by_id[child_id] for child_id in self.children.get(block_id, ())]
+
+    def child_words(self, block_id):
+        """
+        Returns the WORD / SELECTION_ELEMENT children of a block (memoized).
+        """
+        words = self._words.get(block_id)
+        if words is None:
+            by_id = self.by_id
+            words = [
+                child for child in (by_id[child_id] for child_id in self.children.get(block_id, ()))
+                if child["BlockType"] in WORD_TYPES
+            ]
+            self._words[block_id] = words
+        return words
+
+    def text(self, block_id, separator=" ", types=("WORD",)):
+        """
+        Joins the Text of a block's child words (of ``types``) and strips it.
+        """
+        return separator.join(
+            word.get("Text", "") for word in self.child_words(block_id) if word["BlockType"] in types
+        ).strip()
+
+    def value_of(self, key_id):
+        """
+        Returns the VALUE block a KEY points to (its first VALUE Id), or None.
+        """
+        ids = self.value_ids.get(key_id)
+        if not ids:
+            return None
+        value = self.by_id.get(ids[0])
+        if value is None or value["BlockType"] != "KEY_VALUE_SET" or "KEY" in value.get("EntityTypes", ()):
+            return None
+        return value
+
+    def answers(self, query_id):
+        """
+        Returns the QUERY_RESULT blocks answering a QUERY, in response order.
+        """
+        by_id = self.by_id
+        return [by_id[answer_id] for answer_id in self.answer_ids.get(query_id, ()) if answer_id in by_id]
+
+
+def as_index(blocks):
+    """
+    Returns ``blocks`` itself if it is already a BlockIndex, else indexes it.
+    Responses of TEXTRACT_COMPACT_MIN_BLOCKS blocks or more (default
+    100,000) get a compact BlockStore instead (see block_store.py).
+    """
+    if isinstance(blocks, BlockIndex):
+        return blocks
+    with METRICS.stage("index"):
+        from textract_extract.block_store import COMPACT_MIN_BLOCKS, BlockStore
+        if len(blocks) >= int(os.getenv("TEXTRACT_COMPACT_MIN_BLOCKS", COMPACT_MIN_BLOCKS)):
+            return BlockStore(blocks)
+        return BlockIndex(blocks)
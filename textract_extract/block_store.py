@@ -0,0 +1,241 @@
+import itertools
+import math
+from array import array
+
+from textract_extract.block_index import WORD_TYPES, BlockIndex
+
+COMPACT_MIN_BLOCKS = 100_000   # as_index() switches to a BlockStore from this many blocks
+
+# Keys stored in columns; any other key (TableType, Title, SelectionStatus, ...)
+# is kept per block in a small side table
+_COLUMN_KEYS = frozenset({
+    "Id", "BlockType", "Confidence", "Page", "Text", "Geometry", "Relationships", "EntityTypes",
+    "RowIndex", "ColumnIndex", "RowSpan", "ColumnSpan",
+})
+_NO_TEXT = 0   # text_refs value for blocks without a Text key
+_EMPTY = {}
+
+
+class BlockStore(BlockIndex):
+    """
+    Compact, column-oriented stand-in for BlockIndex on very large responses.
+
+    Blocks are numbered by their position in the response and every
+    attribute lives in a flat ``array`` column indexed by that number:
+    block type and entity-type codes, Confidence, Page, the bounding box
+    (left/top/width/height) and the cell row/column/spans. Text is interned once into ``strings`` and referenced
+    by index, and each relationship type (CHILD, VALUE, ...) is a CSR pair:
+    the targets of block ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+    Polygons are dropped and the original Blocks list is not kept.
+
+    It answers the same calls as BlockIndex, so every parser runs on it
+    unchanged. Blocks come back as small dicts built on demand, whose "Id"
+    is the block's number rather than Textract's UUID string.
+    """
+
+    def __init__(self, blocks):
+        row_of = {block["Id"]: row for row, block in enumerate(blocks)}   # Only needed while building
+
+        # Interned block types and entity-type bits
+        self.type_names = list(dict.fromkeys(block["BlockType"] for block in blocks))
+        type_codes = {name: code for code, name in enumerate(self.type_names)}
+        self.type_codes = array("B", [type_codes[block["BlockType"]] for block in blocks])
+        entity_lists = [block.get("EntityTypes") for block in blocks]
+        self.entity_names = list(dict.fromkeys(name for names in entity_lists if names for name in names))
+        entity_bits = {name: 1 << bit for bit, name in enumerate(self.entity_names)}
+        self.entity_masks = array("I", [
+            sum(entity_bits[name] for name in set(names)) if names else 0 for names in entity_lists
+        ])
+
+        # Scalar columns
+        self.confidence = array("d", [block.get("Confidence", math.nan) for block in blocks])
+        self.pages = array("I", [block.get("Page", 1) for block in blocks])
+        boxes = [block.get("Geometry", _EMPTY).get("BoundingBox", _EMPTY) for block in blocks]
+        self.left, self.top, self.width, self.height = (
+            array("f", [box.get(side, 0.0) for box in boxes]) for side in ("Left", "Top", "Width", "Height"))
+        self.row_index, self.column_index, self.row_span, self.column_span = (
+            array("H", [block.get(key, 0) for block in blocks])
+            for key in ("RowIndex", "ColumnIndex", "RowSpan", "ColumnSpan"))
+
+        # String table: every distinct Text once; reference 0 means "no Text"
+        texts = [block.get("Text") for block in blocks]
+        self.strings = [""] + list(dict.fromkeys(text for text in texts if text is not None))
+        string_refs = {text: ref for ref, text in enumerate(self.strings) if ref}
+        self.text_refs = array("I", [_NO_TEXT if text is None else string_refs[text] for text in texts])
+
+        # Relationships as CSR pairs, one per type. Rows are visited in
+        # order, so each type's targets come out grouped by block and the
+        # prefix sums of the per-block counts are the offsets.
+        counts, targets = {}, {}
+        self.extra = {}                                # block -> {other keys}
+        for row, block in enumerate(blocks):
+            for rel in block.get("Relationships", ()):
+                rel_type = rel["Type"]
+                if rel_type not in counts:
+                    counts[rel_type] = array("I", [0]) * len(blocks)
+                    targets[rel_type] = array("I")
+                linked = [row_of[i] for i in rel["Ids"] if i in row_of]
+                counts[rel_type][row] += len(linked)
+                targets[rel_type].extend(linked)
+            if not _COLUMN_KEYS.issuperset(block):
+                self.extra[row] = {key: value for key, value in block.items() if key not in _COLUMN_KEYS}
+
+        self.relations = {
+            rel_type: _Relations(array("I", itertools.accumulate(counts[rel_type], initial=0)), targets[rel_type])
+            for rel_type in counts
+        }
+        empty = _Relations(array("I", [0]) * (len(blocks) + 1), array("I"))
+        self.children = self.relations.get("CHILD", empty)
+        self.value_ids = self.relations.get("VALUE", empty)
+        self.answer_ids = self.relations.get("ANSWER", empty)
+
+        self._rows_by_type = {code: array("I") for code in range(len(self.type_names))}
+        for row, code in enumerate(self.type_codes):
+            self._rows_by_type[code].append(row)
+        self._word_codes = {}
+
+    def __len__(self):
+        return len(self.type_codes)
+
+    # --- Blocks ---
+    def block(self, row):
+        """
+        Rebuilds block ``row`` as a dict (without Geometry or Relationships).
+        """
+        block = {"Id": row, "BlockType": self.type_names[self.type_codes[row]], "Page": self.pages[row]}
+        confidence = self.confidence[row]
+        if confidence == confidence:   # NaN marks a block without Confidence
+            block["Confidence"] = confidence
+        if self.text_refs[row] != _NO_TEXT:
+            block["Text"] = self.strings[self.text_refs[row]]
+        mask = self.entity_masks[row]
+        if mask:
+            block["EntityTypes"] = [name for bit, name in enumerate(self.entity_names) if mask >> bit & 1]
+        if self.row_index[row]:
+            block.update(RowIndex=self.row_index[row], ColumnIndex=self.column_index[row],
+                         RowSpan=self.row_span[row], ColumnSpan=self.column_span[row])
+        extra = self.extra.get(row)
+        if extra:
+            block.update(extra)
+        return block
+
+    def bounding_box(self, row):
+        """
+        Returns block ``row``'s BoundingBox as {'Left', 'Top', 'Width', 'Height'}.
+        """
+        return {"Left": self.left[row], "Top": self.top[row], "Width": self.width[row], "Height": self.height[row]}
+
+    @property
+    def keys(self):
+        key_bit = self._entity_bit("KEY")
+        return [self.block(row) for row in self._rows("KEY_VALUE_SET") if self.entity_masks[row] & key_bit]
+
+    def of_type(self, block_type):
+        return [self.block(row) for row in self._rows(block_type)]
+
+    def select(self, block_type=None, min_confidence=None, page=None):
+        """
+        Returns the numbers of the blocks matching every given filter, in
+        response order. The comparisons run over whole columns, with
+        NumPy when it is installed (``pip install .[compact]``).
+        """
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            if block_type is not None:
+                mask &= _column(numpy, self.type_codes) == self._type_code(block_type)
+            if min_confidence is not None:
+                mask &= _column(numpy, self.confidence) >= min_confidence   # NaN never passes
+            if page is not None:
+                mask &= _column(numpy, self.pages) == page
+            return numpy.flatnonzero(mask).tolist()
+
+        rows = self._rows(block_type) if block_type is not None else range(len(self))
+        if min_confidence is not None:
+            confidence = self.confidence
+            rows = [row for row in rows if confidence[row] >= min_confidence]
+        if page is not None:
+            pages = self.pages
+            rows = [row for row in rows if pages[row] == page]
+        return list(rows)
+
+    # --- Relationships ---
+    def child_blocks(self, block_id):
+        return [self.block(row) for row in self.children.get(block_id, ())]
+
+    def child_words(self, block_id):
+        codes = self._codes(WORD_TYPES)
+        type_codes = self.type_codes
+        return [self.block(row) for row in self.children.get(block_id, ()) if type_codes[row] in codes]
+
+    def text(self, block_id, separator=" ", types=("WORD",)):
+        codes = self._codes(types)
+        type_codes, text_refs, strings = self.type_codes, self.text_refs, self.strings
+        return separator.join([
+            strings[text_refs[row]] for row in self.children.get(block_id, ()) if type_codes[row] in codes
+        ]).strip()
+
+    def value_of(self, key_id):
+        ids = self.value_ids.get(key_id)
+        if not ids:
+            return None
+        row = ids[0]
+        if self.type_names[self.type_codes[row]] != "KEY_VALUE_SET" or self.entity_masks[row] & self._entity_bit("KEY"):
+            return None
+        return self.block(row)
+
+    def answers(self, query_id):
+        return [self.block(row) for row in self.answer_ids.get(query_id, ())]
+
+    # --- Helpers ---
+    def _type_code(self, block_type):
+        try:
+            return self.type_names.index(block_type)
+        except ValueError:
+            return -1
+
+    def _rows(self, block_type):
+        return self._rows_by_type.get(self._type_code(block_type), ())
+
+    def _entity_bit(self, entity):
+        return 1 << self.entity_names.index(entity) if entity in self.entity_names else 0
+
+    def _codes(self, types):
+        # Word types a text() call may join, as type codes (memoized per types tuple)
+        codes = self._word_codes.get(types)
+        if codes is None:
+            codes = self._word_codes[types] = frozenset(
+                self._type_code(block_type) for block_type in types if block_type in WORD_TYPES)
+        return codes
+
+
+class _Relations:
+    """
+    One relationship type in CSR form, read like BlockIndex.children:
+    ``relations.get(block)`` returns the linked block numbers.
+    """
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets, targets):
+        self.offsets = offsets
+        self.targets = targets
+
+    def get(self, row, default=None):
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.targets[start:end] if end > start else default
+
+    def __getitem__(self, row):
+        return self.targets[self.offsets[row]:self.offsets[row + 1]]
+
+    def __contains__(self, row):
+        return self.offsets[row + 1] > self.offsets[row]
+
+
+def _column(numpy, values):
+    # Zero-copy NumPy view of an array column (array and NumPy share type codes)
+    return numpy.frombuffer(values, dtype=values.typecode)
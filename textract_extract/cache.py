@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = ".textract_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # 512 MB of compressed responses
+CACHE_SUFFIX = ".json.z"
+
+
+def make_cache_key(document_bytes, operation, **params):
+    """
+    SHA-256 over the document bytes, the operation name and the request
+    parameters (FeatureTypes etc.), so the same file analysed with
+    different features gets different entries.
+    """
+    digest = hashlib.sha256(document_bytes)
+    digest.update(b"\0" + operation.encode("utf-8"))
+    if "FeatureTypes" in params:
+        params = dict(params, FeatureTypes=sorted(params["FeatureTypes"]))
+    digest.update(b"\0" + json.dumps(params, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of raw Textract responses.
+
+    Each entry is one zlib-compressed JSON file named after its key.
+    The file's mtime records the last hit, which gives LRU order; once the
+    compressed total exceeds ``max_bytes`` the least recently used entries
+    are deleted. Entries older than ``ttl`` seconds are treated as misses.
+    ``refresh=True`` skips reads but still stores fresh responses.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl=None, refresh=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._entries = None   # key -> size, oldest first; loaded lazily
+        self._total_bytes = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Builds a cache from TEXTRACT_CACHE_DIR / TEXTRACT_CACHE_MAX_MB /
+        TEXTRACT_CACHE_TTL / TEXTRACT_CACHE_REFRESH, or returns None
+        (caching off) when TEXTRACT_CACHE_DIR is not set.
+        """
+        directory = os.getenv("TEXTRACT_CACHE_DIR")
+        if not directory:
+            return None
+        max_mb = os.getenv("TEXTRACT_CACHE_MAX_MB")
+        ttl = os.getenv("TEXTRACT_CACHE_TTL")
+        return cls(
+            directory,
+            max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+            ttl=float(ttl) if ttl else None,
+            refresh=os.getenv("TEXTRACT_CACHE_REFRESH", "").lower() in ("1", "true", "yes"),
+        )
+
+    # --- Index ---
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + CACHE_SUFFIX)
+
+    def _load_index(self):
+        if self._entries is not None:
+            return
+        found = []
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(CACHE_SUFFIX):
+                        stat = os.stat(os.path.join(root, name))
+                        found.append((stat.st_mtime, name[:-len(CACHE_SUFFIX)], stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._total_bytes = sum(self._entries.values())
+
+    def _forget(self, key):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._forget(oldest)
+
+    # --- Get / Put ---
+    def get(self, key):
+        """
+        Returns the cached response for ``key`` or None on a miss.
+        """
+        with self._lock:
+            self._load_index()
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    entry = json.loads(zlib.decompress(f.read()))
+            except (OSError, ValueError, zlib.error):
+                self._forget(key)
+                return None
+
+            if self.ttl is not None and time.time() - entry["stored_at"] > self.ttl:
+                self._forget(key)
+                return None
+
+            # Mark as most recently used
+            os.utime(path)
+            self._entries.move_to_end(key)
+            return entry["response"]
+
+    def put(self, key, response):
+        """
+        Stores a response (minus its ResponseMetadata) and evicts LRU
+        entries if the byte budget is exceeded.
+        """
+        response = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+        payload = zlib.compress(
+            json.dumps({"stored_at": time.time(), "response": response},
+                       separators=(",", ":")).encode("utf-8")
+        )
+        path = self._path(key)
+
+        with self._lock:
+            self._load_index()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see half an entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def fetch(self, operation, call, document_bytes, refresh=None, prepare=None, **params):
+        """
+        Returns the cached response for this document/operation/params, or
+        runs ``call(Document={'Bytes': ...}, **params)`` and caches it.
+        The key is always taken from ``document_bytes``; ``prepare``, if
+        given, turns them into the bytes to send, on a miss only.
+        """
+        key = make_cache_key(document_bytes, operation, **params)
+        refresh = self.refresh if refresh is None else refresh
+        if not refresh:
+            response = self.get(key)
+            if response is not None:
+                return response
+
+        response = call(Document={"Bytes": prepare(document_bytes) if prepare else document_bytes}, **params)
+        self.put(key, response)
+        return response
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+
+def cached_call(cache, operation, call, document_bytes, prepare=None, **params):
+    """
+    Calls Textract through ``cache`` when one is given, directly otherwise.
+    """
+    if cache is None:
+        return call(Document={"Bytes": prepare(document_bytes) if prepare else document_bytes}, **params)
+    return cache.fetch(operation, call, document_bytes, prepare=prepare, **params)
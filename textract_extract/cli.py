@@ -0,0 +1,218 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+from textract_extract.batch import DEFAULT_WORKERS, collect_inputs, iter_in_order
+from textract_extract.cache import ResponseCache
+from textract_extract.client import MAX_POOL_CONNECTIONS, get_textract_client
+from textract_extract.forms import iter_key_values
+from textract_extract.invoice import extract_invoice
+from textract_extract.jsonl import add_jsonl_arguments, writer_from_args
+from textract_extract.lines import iter_lines
+from textract_extract.metrics import add_metrics_arguments, metrics_from_args, write_metrics_from_args
+from textract_extract.parallel import PARSE_OPERATIONS, ParsePool
+from textract_extract.profiling import add_profile_arguments, profiler_from_args, write_profile_from_args
+from textract_extract.resume import add_resume_arguments, manifest_from_args
+from textract_extract.server import add_server_arguments, serve_from_args
+from textract_extract.tables import iter_tables
+
+
+# --- Operations (one per subcommand) ---
+def run_lines(doc, textract, cache):
+    # Pages of a PDF run one after another; the job pool supplies the concurrency
+    return {"lines": [line["Text"] for line in iter_lines(doc, textract, cache, max_workers=1)]}
+
+
+def run_forms(doc, textract, cache):
+    return {"pairs": list(iter_key_values(doc, textract, cache))}
+
+
+def run_invoice(doc, textract, cache):
+    return extract_invoice(doc, textract, cache)
+
+
+def run_expense(doc, textract, cache):
+    return extract_invoice(doc, textract, cache, mode="expense")
+
+
+def run_tables(doc, textract, cache):
+    return {"tables": list(iter_tables(doc, textract, cache))}
+
+
+# Subcommand / manifest operation name -> function(doc, textract, cache) -> record fields
+OPERATIONS = {
+    "lines": run_lines,
+    "forms": run_forms,
+    "invoice": run_invoice,
+    "expense": run_expense,
+    "tables": run_tables,
+}
+
+
+# --- Route Manifest ---
+def read_route_manifest(source):
+    """
+    Yields (file, operation) pairs from a route manifest, lazily.
+
+    Each line is either ``file,operation`` (CSV, so paths with commas can be
+    quoted) or a JSON object with "file" and "operation" keys. Blank lines
+    and lines starting with '#' are skipped. ``-`` reads stdin. Relative
+    paths are resolved against the manifest's own directory.
+    """
+    base_dir = "" if source == "-" else os.path.dirname(source)
+    with (nullcontext(sys.stdin) if source == "-" else open(source, "r", encoding="utf-8")) as manifest:
+        for number, line in enumerate(manifest, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                file_path, operation = entry["file"], entry["operation"]
+            else:
+                row = next(csv.reader([line]))
+                if len(row) != 2:
+                    raise ValueError(f"{source}:{number}: expected 'file,operation', got {line!r}")
+                file_path, operation = row[0].strip(), row[1]
+            yield os.path.join(base_dir, file_path), operation.strip().lower()
+
+
+# --- Runner ---
+class _StdoutWriter:
+    """
+    Minimal JsonLinesWriter stand-in that prints compact records to stdout.
+    """
+
+    path = "<stdout>"
+
+    def write(self, record):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+
+    def close(self):
+        sys.stdout.flush()
+
+
+def run_jobs(jobs, writer, max_workers=DEFAULT_WORKERS, textract=None, cache=None, parse_pool=None,
+             run_manifest=None):
+    """
+    Runs (file, operation) jobs through one shared client and cache on a
+    bounded thread pool, writing one record per job in input order.
+    With a ParsePool the threads only call Textract and the parsing runs
+    on its worker processes. With a RunManifest, jobs it records as done
+    are skipped and every outcome is recorded in it.
+    Returns (succeeded, failed); status lines go to stderr so stdout can
+    carry the records.
+    """
+    textract = textract or get_textract_client(max_pool_connections=max(max_workers, MAX_POOL_CONNECTIONS))
+
+    def process(job):
+        file_path, operation = job
+        if operation not in OPERATIONS:
+            raise ValueError(f"unknown operation '{operation}' (choose from {', '.join(OPERATIONS)})")
+        if parse_pool is not None and operation in PARSE_OPERATIONS:
+            return parse_pool.fetch_and_submit(operation, file_path, textract, cache)
+        return OPERATIONS[operation](file_path, textract, cache)
+
+    if run_manifest is not None:
+        jobs = run_manifest.pending(jobs)
+
+    succeeded = failed = 0
+    for (file_path, operation), fields, error in iter_in_order(process, jobs, max_workers):
+        if isinstance(fields, Future):
+            # Parsed on the pool: wait for it here, in input order
+            try:
+                fields = fields.result()
+            except Exception as e:
+                fields, error = None, e
+        record = {"document": file_path, "operation": operation}
+        if error is None:
+            succeeded += 1
+            writer.write({**record, **fields})
+        else:
+            failed += 1
+            writer.write({**record, "error": str(error)})
+            print(f"{file_path} ({operation}) -> FAILED: {error}", file=sys.stderr)
+        if run_manifest is not None:
+            run_manifest.record(file_path, operation, writer.path, error)
+
+    skipped = ""
+    if run_manifest is not None and run_manifest.skipped:
+        skipped = f" ({run_manifest.skipped} already done)"
+    print(f"Done: {succeeded}/{succeeded + failed} documents written to {writer.path}{skipped}", file=sys.stderr)
+    return succeeded, failed
+
+
+# --- Command Line ---
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="textract-extract",
+        description="Run Textract extractions from one warm process.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("lines", "text lines (DetectDocumentText)"),
+        ("forms", "key-value pairs (AnalyzeDocument FORMS)"),
+        ("invoice", "invoice fields and line items (AnalyzeDocument FORMS+TABLES)"),
+        ("expense", "invoice fields and line items (AnalyzeExpense)"),
+        ("tables", "tables with titles and footers (AnalyzeDocument TABLES)"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("sources", nargs="+", help="files, directories, glob patterns or manifests")
+        _add_common_arguments(command)
+
+    route = commands.add_parser("route", help="run a manifest of (file, operation) pairs")
+    route.add_argument("manifest", help="'file,operation' or JSON lines; '-' reads stdin")
+    _add_common_arguments(route)
+
+    serve = commands.add_parser("serve", help="run a local HTTP / Unix socket extraction service")
+    add_server_arguments(serve)
+    return parser
+
+
+def _add_common_arguments(parser):
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent Textract calls")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="parse responses on this many processes (0: in the calling threads)")
+    add_jsonl_arguments(parser)
+    add_resume_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser)
+
+
+def main(argv=None):
+    """
+    Entry point of the ``textract-extract`` command. Records are written
+    as JSON lines to --jsonl, or to stdout without it.
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "serve":
+        return serve_from_args(args)
+    if args.command == "route":
+        jobs = read_route_manifest(args.manifest)
+    else:
+        jobs = ((path, args.command) for source in args.sources for path in collect_inputs(source))
+
+    metrics_from_args(args)
+    profiler = profiler_from_args(args)
+    writer = writer_from_args(args) or _StdoutWriter()
+    parse_pool = ParsePool(args.parse_workers) if args.parse_workers > 0 else None
+    # Records on stdout are flushed as they are written; a --jsonl file is followed until its fsync
+    run_manifest = manifest_from_args(args, writer if args.jsonl else None)
+    try:
+        _, failed = run_jobs(jobs, writer, args.workers, cache=ResponseCache.from_env(), parse_pool=parse_pool,
+                             run_manifest=run_manifest)
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+        if run_manifest is not None:
+            run_manifest.close()
+        writer.close()
+        write_metrics_from_args(args)
+        write_profile_from_args(args, profiler, args.jsonl)
+    return 1 if failed else 0
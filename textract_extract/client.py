@@ -0,0 +1,115 @@
+import os
+import threading
+
+# --- Connection Pool / Timeout Defaults ---
+MAX_POOL_CONNECTIONS = 50   # Matches the largest thread pool we run against one client
+CONNECT_TIMEOUT = 5         # Seconds to open the TLS connection
+READ_TIMEOUT = 60           # Seconds to wait for a sync Textract response
+BOTOCORE_MAX_ATTEMPTS = 1   # Retries are done by retry.py, under one budget and circuit breaker
+
+_clients = {}
+_clients_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env_once():
+    """
+    Loads the .env file the first time a client is requested.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def resolve_region(region_name=None):
+    """
+    Returns the region to use, falling back to AWS_REGION and then
+    AWS_DEFAULT_REGION from the environment / .env file.
+    """
+    _load_env_once()
+    return region_name or os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION")
+
+
+def build_config(max_pool_connections=MAX_POOL_CONNECTIONS,
+                 connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT,
+                 max_attempts=BOTOCORE_MAX_ATTEMPTS):
+    """
+    Builds the botocore Config shared by every Textract client.
+    botocore's own retries are off by default (retry.py retries instead);
+    "adaptive" mode still rate-limits sending after throttles.
+    """
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=max_pool_connections,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={"mode": "adaptive", "total_max_attempts": max_attempts},
+    )
+
+
+def get_textract_client(region_name=None, aws_access_key_id=None,
+                        aws_secret_access_key=None, aws_session_token=None,
+                        endpoint_url=None, **config_kwargs):
+    """
+    Returns a pooled Textract client, creating it on first use.
+
+    Clients are cached per (region, credentials, endpoint, config) so every
+    call in a batch reuses the same warm connection pool. botocore clients
+    are thread-safe once built; only construction is guarded by a lock.
+    boto3 and .env are only loaded here, so importing this module is cheap.
+
+    ``endpoint_url`` (or TEXTRACT_ENDPOINT_URL) points the client at a
+    different endpoint, e.g. the local emulator in emulator.py.
+    """
+    _load_env_once()
+
+    endpoint_url = endpoint_url or os.getenv("TEXTRACT_ENDPOINT_URL") or None
+    region = resolve_region(region_name)
+    access_key = aws_access_key_id or os.getenv("AWS_ACCESS_KEY_ID") or None
+    secret_key = aws_secret_access_key or os.getenv("AWS_SECRET_ACCESS_KEY") or None
+    session_token = aws_session_token or os.getenv("AWS_SESSION_TOKEN") or None
+
+    cache_key = (
+        region,
+        access_key,
+        secret_key,
+        session_token,
+        endpoint_url,
+        tuple(sorted(config_kwargs.items())),
+    )
+
+    client = _clients.get(cache_key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            import boto3
+
+            # A private Session per client: the boto3 default session is not thread-safe
+            session = boto3.session.Session(
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                aws_session_token=session_token,
+                region_name=region,
+            )
+            client = session.client(
+                "textract",
+                endpoint_url=endpoint_url,
+                config=build_config(**config_kwargs),
+            )
+            _clients[cache_key] = client
+    return client
+
+
+def clear_client_cache():
+    """
+    Drops every cached client (e.g. after rotating credentials).
+    """
+    with _clients_lock:
+        _clients.clear()
@@ -0,0 +1,91 @@
+from textract_extract.block_index import BlockIndex
+from textract_extract.cache import cached_call
+from textract_extract.client import get_textract_client
+from textract_extract.metrics import METRICS
+from textract_extract.payload import FittedPayload, fit_payload, load_document
+from textract_extract.retry import retrying
+
+# Textract API operation -> boto3 client method
+CLIENT_METHODS = {
+    "DetectDocumentText": "detect_document_text",
+    "AnalyzeDocument": "analyze_document",
+    "AnalyzeExpense": "analyze_expense",
+}
+
+
+def read_bytes(doc):
+    """
+    Returns the bytes of a file path, raw bytes or FittedPayload, as they
+    are (not fitted).
+    """
+    if isinstance(doc, FittedPayload):
+        return doc.data
+    if isinstance(doc, (bytes, bytearray)):
+        return bytes(doc)
+    with METRICS.stage("read"), open(doc, "rb") as f:
+        return f.read()
+
+
+def read_document(doc):
+    """
+    Returns a FittedPayload for a file path, raw bytes or a FittedPayload.
+    """
+    if isinstance(doc, FittedPayload):
+        return doc
+    with METRICS.stage("read"):
+        if isinstance(doc, (bytes, bytearray)):
+            return fit_payload(bytes(doc))
+        return load_document(doc)
+
+
+def fit_bytes(data):
+    """
+    Returns ``data`` fitted to the sync API limits, counting what the
+    fitting did (textract_payload_fits_total / _bytes_saved_total).
+    """
+    with METRICS.stage("read"):
+        payload = fit_payload(data)
+    for action in payload.actions:
+        METRICS.inc("textract_payload_fits_total", action=action.split(" ", 1)[0])
+    if payload.actions:
+        METRICS.inc("textract_payload_bytes_saved_total", payload.bytes_saved)
+    return payload.data
+
+
+def get_response(doc, operation, textract=None, cache=None, projection=None, **params):
+    """
+    Returns the whole Textract response for ``doc``.
+
+    ``doc`` may be a file path, raw bytes or FittedPayload (sent to
+    ``operation`` with ``params``, through ``cache`` if given) or an
+    already-fetched response dict (returned as-is).
+    The cache is keyed on the document's own bytes; a file or raw bytes
+    are only fitted to the sync limits (see payload.py) on a miss.
+    A fetched response is cut down by ``projection`` (see projection.py)
+    straight away, so the full response can be freed before parsing;
+    the cache still stores it whole.
+    """
+    if isinstance(doc, dict):
+        return doc
+
+    data = read_bytes(doc)
+    textract = textract or get_textract_client()
+    call = retrying(METRICS.instrument_call(getattr(textract, CLIENT_METHODS[operation]), operation, params))
+    prepare = None if isinstance(doc, FittedPayload) else fit_bytes
+    response = cached_call(cache, operation, call, data, prepare, **params)
+    if projection is not None:
+        with METRICS.stage("project"):
+            response = projection.apply(response)
+    return response
+
+
+def get_blocks(doc, operation, textract=None, cache=None, projection=None, **params):
+    """
+    Returns the Blocks for ``doc``, calling Textract only when needed.
+
+    ``doc`` may be anything get_response accepts, or a BlockIndex
+    (returned as-is).
+    """
+    if isinstance(doc, BlockIndex):
+        return doc
+    return get_response(doc, operation, textract, cache, projection, **params)["Blocks"]
@@ -0,0 +1,257 @@
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from textract_extract.synthetic import generate_expense_response, generate_response
+
+# Operations the emulator answers, keyed by the X-Amz-Target suffix
+SUPPORTED_OPERATIONS = ("DetectDocumentText", "AnalyzeDocument", "AnalyzeExpense")
+
+# Injected error codes answered with HTTP 500 (everything else is a 400)
+SERVER_ERROR_CODES = ("InternalServerError", "ServiceUnavailableException")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+# --- Latency Model ---
+class LatencyModel:
+    """
+    Samples per-request latency in seconds. Spec strings:
+        fixed:0.8            -> always 0.8 s
+        uniform:1:3          -> uniform between 1 and 3 s
+        lognormal:1.5:0.4    -> median 1.5 s, sigma 0.4 (long right tail)
+    """
+
+    def __init__(self, spec="fixed:0"):
+        kind, *args = spec.split(":")
+        args = [float(a) for a in args]
+        if kind == "fixed" and len(args) == 1:
+            self._sample = lambda rng: args[0]
+        elif kind == "uniform" and len(args) == 2:
+            self._sample = lambda rng: rng.uniform(args[0], args[1])
+        elif kind == "lognormal" and len(args) == 2:
+            mu = math.log(args[0]) if args[0] > 0 else 0.0
+            self._sample = lambda rng: rng.lognormvariate(mu, args[1])
+        else:
+            raise ValueError(f"Invalid latency spec '{spec}'")
+        self.spec = spec
+
+    def sample(self, rng=random):
+        return max(0.0, self._sample(rng))
+
+
+# --- TPS Limiter ---
+class RateLimiter:
+    """
+    Thread-safe, non-blocking token bucket used to answer over-quota
+    requests with ThrottlingException, like the real service.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+# --- Emulator State ---
+class TextractEmulator:
+    """
+    Serves DetectDocumentText / AnalyzeDocument / AnalyzeExpense over the
+    Textract JSON protocol with configurable latency, per-operation TPS
+    limits and injected errors.
+
+    ``responses_dir`` may hold recorded responses named
+    ``<sha256 of document bytes>.json`` (exact match) or
+    ``<Operation>.json`` (fallback for any document); anything else gets
+    a synthetic response.
+    """
+
+    def __init__(self, latency="fixed:0", tps=None, error_rate=0.0,
+                 error_code="InternalServerError", responses_dir=None, seed=None):
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency)
+        self.limiters = {op: RateLimiter(rate) for op, rate in (tps or {}).items()}
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.responses_dir = responses_dir
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+        # Private generator: seeding it leaves the process-wide random module alone
+        self._random = random.Random(seed)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _recorded(self, operation, document_bytes):
+        if not self.responses_dir:
+            return None
+        digest = hashlib.sha256(document_bytes).hexdigest()
+        for name in (digest + ".json", operation + ".json"):
+            path = os.path.join(self.responses_dir, name)
+            if os.path.isfile(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        return None
+
+    def handle(self, operation, request):
+        """
+        Returns (status, body dict) for one API request.
+        """
+        self._count("requests")
+
+        if operation not in SUPPORTED_OPERATIONS:
+            return 400, {"__type": "UnsupportedOperationException",
+                         "message": f"{operation} is not emulated"}
+
+        limiter = self.limiters.get(operation)
+        if limiter is not None and not limiter.try_acquire():
+            self._count("throttled")
+            return 400, {"__type": "ThrottlingException", "message": "Rate exceeded"}
+
+        time.sleep(self.latency.sample(self._random))
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self._count("errors")
+            status = 500 if self.error_code in SERVER_ERROR_CODES else 400
+            return status, {"__type": self.error_code, "message": "Injected error"}
+
+        try:
+            document_bytes = base64.b64decode(request["Document"]["Bytes"])
+        except (KeyError, TypeError, ValueError):
+            return 400, {"__type": "InvalidParameterException",
+                         "message": "Request has invalid Document.Bytes"}
+
+        response = self._recorded(operation, document_bytes)
+        if response is None and operation == "AnalyzeExpense":
+            response = generate_expense_response(line_items=5, seed=self._random.getrandbits(32))
+        elif response is None:
+            feature_types = request.get("FeatureTypes", ())
+            queries = request.get("QueriesConfig", {}).get("Queries", ()) if "QUERIES" in feature_types else ()
+            response = generate_response(
+                lines_per_page=20,
+                kv_pairs=10 if "FORMS" in feature_types else 0,
+                tables=1 if "TABLES" in feature_types else 0,
+                queries=queries,
+                seed=self._random.getrandbits(32),
+                operation=operation,
+            )
+        return 200, response
+
+
+def _make_handler(emulator):
+    class TextractHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            target = self.headers.get("X-Amz-Target", "")
+            operation = target.split(".", 1)[-1]
+            length = self.headers.get("Content-Length", "0").strip()
+            if not length.isdecimal():
+                # The body cannot be skipped without a length, so drop the connection
+                self.close_connection = True
+                self._reply(400, {"__type": "SerializationException",
+                                  "message": "Content-Length must be a non-negative integer"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(length)) or b"{}")
+            except ValueError:
+                request = {}
+
+            self._reply(*emulator.handle(operation, request))
+
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.1")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("x-amzn-RequestId", str(uuid.uuid4()))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass   # Keep benchmark output clean
+
+    return TextractHandler
+
+
+def start_emulator(host=DEFAULT_HOST, port=0, **options):
+    """
+    Starts the emulator on a background thread and returns the server.
+    ``server.url`` is the endpoint_url to give get_textract_client();
+    call ``server.shutdown()`` when done.
+    """
+    emulator = TextractEmulator(**options)
+    server = ThreadingHTTPServer((host, port), _make_handler(emulator))
+    server.daemon_threads = True
+    server.emulator = emulator
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _parse_tps(values):
+    tps = {}
+    for value in values or []:
+        operation, _, rate = value.partition("=")
+        tps[operation] = float(rate)
+    return tps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Textract emulator for offline testing.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:S, uniform:MIN:MAX or lognormal:MEDIAN:SIGMA (seconds)")
+    parser.add_argument("--tps", action="append", metavar="OPERATION=RATE",
+                        help="e.g. --tps DetectDocumentText=10 (repeatable)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-code", default="InternalServerError")
+    parser.add_argument("--responses", help="directory of recorded responses")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    emulator = TextractEmulator(
+        latency=args.latency,
+        tps=_parse_tps(args.tps),
+        error_rate=args.error_rate,
+        error_code=args.error_code,
+        responses_dir=args.responses,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(emulator))
+    server.daemon_threads = True
+    print(f"Textract emulator listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {emulator.stats}")
+
+
+if __name__ == "__main__":
+    main()
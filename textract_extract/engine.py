@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from functools import partial
+
+from textract_extract.client import get_textract_client
+from textract_extract.documents import CLIENT_METHODS, get_blocks, get_response
+from textract_extract.lines import iter_lines
+from textract_extract.parsers import (
+    parse_expense,
+    parse_invoice,
+    parse_key_values,
+    parse_query_answers,
+    parse_table_blocks,
+)
+from textract_extract.projection import projection_for
+
+# --- Default Per-Operation TPS Quotas ---
+# FORMS, TABLES and the invoice path all count against the AnalyzeDocument
+# quota, so they share one bucket; DetectDocumentText and AnalyzeExpense
+# have their own.
+DEFAULT_RATES = {
+    "DetectDocumentText": 10.0,
+    "AnalyzeDocument": 10.0,
+    "AnalyzeExpense": 5.0,
+}
+DEFAULT_MAX_WORKERS = 32
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket: ``rate`` tokens per second, bursting up to
+    ``capacity``. ``acquire()`` waits until a token is available. The
+    bucket may be used from one event loop after another (not at once).
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1.0):
+        # The lock keeps waiters in FIFO order so no caller starves. An
+        # asyncio.Lock binds to the loop it first waits on, so each loop gets its own
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class _RateLimitedClient:
+    """
+    Textract client stand-in whose API methods first take a token from
+    their operation's bucket (see TextractEngine._acquire). Every attempt
+    pays, retries included, and cache hits never get here.
+    """
+
+    _OPERATIONS = {method: operation for operation, method in CLIENT_METHODS.items()}
+
+    def __init__(self, client, acquire):
+        self._client = client
+        self._acquire = acquire
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        operation = self._OPERATIONS.get(name)
+        if operation is None:
+            return method
+
+        def limited(**kwargs):
+            self._acquire(operation)
+            return method(**kwargs)
+        return limited
+
+
+class TextractEngine:
+    """
+    Runs Textract calls from asyncio code with one token bucket per API
+    operation, charged for every attempt (retries included). The blocking
+    boto3 calls and the block parsing run on a thread pool that shares
+    the pooled client from client.py. An optional ResponseCache serves
+    repeated documents without an API call or a token.
+
+    Usage:
+        async with TextractEngine(rates={"AnalyzeDocument": 5}) as engine:
+            tables = await engine.analyze_tables("table.png")
+    """
+
+    def __init__(self, rates=None, burst=None, max_workers=DEFAULT_MAX_WORKERS, textract=None,
+                 cache=None):
+        self.rates = dict(DEFAULT_RATES)
+        self.rates.update(rates or {})
+        burst = burst or {}
+        self.buckets = {
+            operation: TokenBucket(rate, burst.get(operation))
+            for operation, rate in self.rates.items()
+        }
+        self.textract = textract or get_textract_client(max_pool_connections=max_workers)
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._closed = False
+        self._waiting = set()   # Token requests pending on the event loop
+        self._waiting_lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Waiting for the pool on the loop thread would deadlock workers
+        # that still need the loop for a token, so wait off the loop
+        self._stop()
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    def close(self):
+        """
+        Stops the engine: queued calls are cancelled, calls waiting for a
+        token raise RuntimeError, and calls already sent are waited for.
+        """
+        self._stop()
+        self._executor.shutdown(wait=True)
+
+    def _stop(self):
+        with self._waiting_lock:
+            self._closed = True
+            waiting, self._waiting = self._waiting, set()
+        for future in waiting:
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self, operation, loop):
+        # Runs on a worker thread: blocks until the bucket on the engine's loop grants a token
+        bucket = self.buckets.get(operation)
+        if bucket is None:
+            return
+        with self._waiting_lock:
+            if self._closed:
+                raise RuntimeError("TextractEngine is closed")
+            future = asyncio.run_coroutine_threadsafe(bucket.acquire(), loop)
+            self._waiting.add(future)
+        try:
+            future.result()
+        except CancelledError:
+            raise RuntimeError("TextractEngine is closed") from None
+        finally:
+            with self._waiting_lock:
+                self._waiting.discard(future)
+
+    async def _submit(self, function, *args):
+        # Runs function(rate_limited_client, *args) on the thread pool
+        loop = asyncio.get_running_loop()
+        textract = _RateLimitedClient(self.textract, partial(self._acquire, loop=loop))
+        return await loop.run_in_executor(self._executor, partial(function, textract, *args))
+
+    async def _run(self, operation, extractor, parse, document, **params):
+        return await self._submit(self._call_and_parse, operation, extractor, parse, document, params)
+
+    def _call_and_parse(self, textract, operation, extractor, parse, document, params):
+        # AnalyzeExpense keeps its fields outside Blocks, so it parses the whole response
+        fetch = get_response if operation == "AnalyzeExpense" else get_blocks
+        return parse(fetch(document, operation, textract, self.cache, projection_for(extractor), **params))
+
+    def _detect_lines(self, textract, document):
+        # Multi-page PDFs are split and sent page by page, like the sync path
+        return [line["Text"] for line in iter_lines(document, textract, self.cache, max_workers=1)]
+
+    # --- Public Coroutines ---
+    async def detect(self, document):
+        """
+        DetectDocumentText -> list of LINE texts (every page of a PDF, in
+        order; one token per page).
+        """
+        return await self._submit(self._detect_lines, document)
+
+    async def analyze_forms(self, document):
+        """
+        AnalyzeDocument(FORMS) -> list of key/value/confidence dicts.
+        """
+        return await self._run("AnalyzeDocument", "forms", parse_key_values, document, FeatureTypes=["FORMS"])
+
+    async def analyze_queries(self, document, queries):
+        """
+        AnalyzeDocument(QUERIES) -> one key/value/confidence dict per query
+        (``queries`` as built by queries.build_queries / queries_for).
+        """
+        return await self._run("AnalyzeDocument", "queries", parse_query_answers, document,
+                               FeatureTypes=["QUERIES"], QueriesConfig={"Queries": queries})
+
+    async def analyze_tables(self, document):
+        """
+        AnalyzeDocument(TABLES) -> tables in the output5.json structure.
+        """
+        return await self._run(
+            "AnalyzeDocument", "tables", parse_table_blocks, document, FeatureTypes=["TABLES"]
+        )
+
+    async def analyze_invoice(self, document):
+        """
+        AnalyzeDocument(FORMS, TABLES) -> the output4.json structure.
+        """
+        return await self._run(
+            "AnalyzeDocument", "invoice", parse_invoice, document, FeatureTypes=["FORMS", "TABLES"]
+        )
+
+    async def analyze_expense(self, document):
+        """
+        AnalyzeExpense -> the output4.json structure.
+        """
+        return await self._run("AnalyzeExpense", "expense", parse_expense, document)
@@ -0,0 +1,81 @@
+import argparse
+
+from textract_extract.block_index import as_index
+from textract_extract.cache import ResponseCache
+from textract_extract.documents import get_blocks, read_bytes
+from textract_extract.metrics import METRICS, add_metrics_arguments, metrics_from_args, write_metrics_from_args
+from textract_extract.parsers import format_key_value, iter_key_value_pairs, iter_query_answers
+from textract_extract.profiling import add_profile_arguments, profiler_from_args, write_profile_from_args
+from textract_extract.projection import projection_for
+from textract_extract.queries import queries_for
+
+
+# --- Lazy Key-Value Extraction (script 3) ---
+def iter_key_values(doc, textract=None, cache=None, queries=None):
+    """
+    Yields a form's key-value pairs as {'key', 'value', 'confidence'} dicts.
+    ``doc`` may be a file path, raw bytes, an AnalyzeDocument(FORMS)
+    response or a BlockIndex.
+
+    With ``queries`` (a QueriesConfig ``Queries`` list, see queries.py)
+    only those fields are asked for with the QUERIES feature instead of
+    FORMS, and each query's answer is yielded in the same shape.
+    """
+    if queries:
+        blocks = as_index(get_blocks(doc, "AnalyzeDocument", textract, cache, projection_for("queries"),
+                                     FeatureTypes=["QUERIES"], QueriesConfig={"Queries": queries}))
+        yield from METRICS.timed_iter("key_values", iter_query_answers(blocks))
+        return
+    blocks = as_index(get_blocks(doc, "AnalyzeDocument", textract, cache, projection_for("forms"),
+                                 FeatureTypes=["FORMS"]))
+    yield from METRICS.timed_iter("key_values", iter_key_value_pairs(blocks))
+
+
+def analyze_form_from_local_file(file_path, output_file, cache=None, textract=None, queries=None):
+    # Read the image as-is: it is fitted to the sync API limits only on a cache miss
+    document = read_bytes(file_path)
+
+    # Traverse blocks to find key-value pairs (served from the cache when given)
+    results = []
+    for pair in iter_key_values(document, textract, cache, queries):
+        line = format_key_value(pair)
+        print(line)
+        results.append(line)
+
+    with METRICS.stage("write"), open(output_file, 'w', encoding='utf-8') as f:
+        f.write("Extracted Key-Value Pairs\n\n")
+        for line in results:
+            f.write(line + "\n")
+
+    print(f"Results saved to {output_file}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract key-value pairs from a form (FORMS).")
+    parser.add_argument("file", nargs="?", default="form.png", help="input filename")
+    parser.add_argument("--output", default="output3.txt", help="where to save the pairs")
+    parser.add_argument("--queries", metavar="TYPE",
+                        help="ask only this document type's questions (QUERIES) instead of extracting every "
+                             "FORMS pair, e.g. form or invoice")
+    parser.add_argument("--queries-file", help="JSON of {type: {alias: question}} (default: TEXTRACT_QUERIES_FILE)")
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics_from_args(args)
+    profiler = profiler_from_args(args)
+
+    try:
+        queries = queries_for(args.queries, args.queries_file) if args.queries else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    try:
+        analyze_form_from_local_file(args.file, args.output, cache=ResponseCache.from_env(), queries=queries)
+    except Exception as e:
+        # Throttles and 5xx were already retried (see retry.py)
+        print(f"Error during Textract API call: {e}")
+        return 1
+    finally:
+        write_metrics_from_args(args)
+        write_profile_from_args(args, profiler, args.output)
+    return 0
@@ -0,0 +1,197 @@
+import difflib
+import functools
+import json
+import os
+import re
+import threading
+
+DEFAULT_CACHE_SIZE = 4096   # Distinct header strings remembered per normalizer
+FUZZY_CUTOFF = 0.8          # difflib ratio needed to correct an OCR-mangled word ("Quantlty")
+MIN_FUZZY_LENGTH = 4        # Shorter words are only matched exactly or as a synonym's prefix
+
+# Line-item field -> header phrases that mean it. Matching is per whole
+# word, longest phrase first, so "Total Price" is a line total and not a
+# unit price, and "Tax Code" is a tax code and not an item code.
+FIELD_SYNONYMS = {
+    "description": (
+        "description", "desc", "item", "items", "item description", "product", "product name",
+        "service", "services", "details", "particulars", "article", "goods", "item name",
+    ),
+    "item_code": (
+        "item no", "item number", "item code", "sku", "part no", "part number", "product code",
+        "product no", "article no", "code",
+    ),
+    "unit": (
+        "unit", "uom", "u/m", "um", "unit of measure", "units of measure", "unit of measurement", "measure",
+    ),
+    "quantity": (
+        "qty", "quantity", "qnty", "units", "hours", "hrs", "pcs", "pieces", "count",
+        "no of units", "number of units", "qty ordered", "qty shipped",
+    ),
+    "unit_price": (
+        "unit price", "price", "rate", "unit cost", "cost", "price each", "each", "per unit",
+        "price unit", "unit rate", "price per unit", "list price", "hourly rate", "unit amount",
+    ),
+    "tax": (
+        "tax", "vat", "gst", "hst", "tax amount", "sales tax", "tax rate", "vat amount", "tax total",
+    ),
+    "tax_code": (
+        "tax code", "vat code", "gst code", "tax category", "tax class", "tax type",
+    ),
+    "line_total": (
+        "total", "line total", "amount", "amt", "total price", "total amount", "line amount",
+        "net amount", "extended price", "ext price", "extended", "ext", "subtotal", "sub total",
+        "gross amount",
+    ),
+}
+
+_NOT_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def _words(text):
+    # "Item #" -> ["item", "no"]; "Qty." -> ["qty"]; "Unit-Price (USD)" -> ["unit", "price", "usd"]
+    return _NOT_WORD.sub(" ", text.lower().replace("#", " no ")).split()
+
+
+def snake_case(header):
+    """
+    Returns a header's own name: "Ship Date" -> "ship_date".
+    """
+    words = _words(header)
+    return "_".join(words) if words else header.strip().lower().replace(" ", "_")
+
+
+class HeaderNormalizer:
+    """
+    Maps table header text to line-item field names ("Unit Price" ->
+    "unit_price") from a synonym dictionary.
+
+    The synonyms are compiled once into a phrase map, a prefix map of
+    their words (a flattened trie, so "Descr" finds "description") and a
+    word list for fuzzy matching OCR slips. A header is looked up by its
+    longest known phrase; ties go to the rightmost one, since the last
+    word usually names the column ("Item Price" is a price). Headers that
+    match nothing become snake_case ("Ship Date" -> "ship_date").
+
+    Results are memoized per distinct header string, so a batch pays for
+    each vendor's headers once.
+    """
+
+    def __init__(self, synonyms=None, fuzzy_cutoff=FUZZY_CUTOFF, cache_size=DEFAULT_CACHE_SIZE):
+        self.synonyms = {field: tuple(phrases) for field, phrases in (synonyms or FIELD_SYNONYMS).items()}
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+        self._phrases = {}
+        for field, phrases in self.synonyms.items():
+            for phrase in phrases:
+                self._phrases.setdefault(" ".join(_words(phrase)), field)
+        self._longest = max((phrase.count(" ") + 1 for phrase in self._phrases), default=0)
+
+        self._vocabulary = sorted({word for phrase in self._phrases for word in phrase.split()})
+        self._known = frozenset(self._vocabulary)
+        prefixes = {}
+        for word in self._vocabulary:
+            for end in range(MIN_FUZZY_LENGTH, len(word)):
+                prefixes.setdefault(word[:end], set()).add(word)
+        self._prefixes = {prefix: words.pop() for prefix, words in prefixes.items() if len(words) == 1}
+
+        self.field = functools.lru_cache(maxsize=cache_size)(self._field)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Builds a normalizer from a JSON file of {"field": ["synonym", ...]}.
+        Its phrases are tried before the built-in ones, and new fields
+        may be added.
+        """
+        with open(path, encoding="utf-8") as f:
+            extra = json.load(f)
+        synonyms = {field: tuple(phrases) for field, phrases in extra.items()}
+        for field, phrases in FIELD_SYNONYMS.items():
+            synonyms[field] = synonyms.get(field, ()) + phrases
+        return cls(synonyms, **kwargs)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Uses the synonym file in TEXTRACT_HEADER_SYNONYMS, or the built-in
+        dictionary when it is not set.
+        """
+        path = os.getenv("TEXTRACT_HEADER_SYNONYMS")
+        return cls.from_file(path) if path else cls()
+
+    def fields(self, headers):
+        """
+        Maps several headers at once; returns a list of field names.
+        """
+        return [self.field(header) for header in headers]
+
+    def unique_fields(self, headers):
+        """
+        Maps a header row like fields(), but never gives two columns one
+        name: the first header of a field keeps it, and a later one falls
+        back to its own snake_case name (then to "<name>_<position>").
+        """
+        names = []
+        used = set()
+        for position, header in enumerate(headers, start=1):
+            name = self.field(header)
+            if name in used:
+                name = snake_case(header) or "column"
+                if name in used:
+                    name = f"{name}_{position}"
+            used.add(name)
+            names.append(name)
+        return names
+
+    def _field(self, header):
+        words = _words(header)
+        if not words:
+            return snake_case(header)
+        field = self._phrases.get(" ".join(words))
+        if field is not None:
+            return field
+
+        words = [self._known_word(word) for word in words]
+        for size in range(min(len(words), self._longest), 0, -1):
+            for start in range(len(words) - size, -1, -1):
+                field = self._phrases.get(" ".join(words[start:start + size]))
+                if field is not None:
+                    return field
+        return snake_case(header)
+
+    def _known_word(self, word):
+        if word in self._known or len(word) < MIN_FUZZY_LENGTH:
+            return word
+        if word in self._prefixes:
+            return self._prefixes[word]
+        close = difflib.get_close_matches(word, self._vocabulary, n=1, cutoff=self.fuzzy_cutoff)
+        return close[0] if close else word
+
+
+# --- Shared Normalizer (scripts 4 and 5) ---
+_normalizer = None
+_normalizer_lock = threading.Lock()
+
+
+def get_header_normalizer():
+    """
+    Returns the normalizer shared by the invoice and table parsers, built
+    on first use (see HeaderNormalizer.from_env).
+    """
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = HeaderNormalizer.from_env()
+    return _normalizer
+
+
+def set_header_normalizer(normalizer):
+    """
+    Replaces the shared normalizer (e.g. with one built from a vendor's
+    synonym file).
+    """
+    global _normalizer
+    with _normalizer_lock:
+        _normalizer = normalizer
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+
+from textract_extract.block_index import BlockIndex, as_index
+from textract_extract.cache import ResponseCache
+from textract_extract.documents import get_blocks, get_response, read_bytes
+from textract_extract.jsonl import add_jsonl_arguments, writer_from_args
+from textract_extract.metrics import METRICS, add_metrics_arguments, metrics_from_args, write_metrics_from_args
+from textract_extract.parsers import iter_expense_line_items, iter_table_line_items, parse_expense, parse_invoice
+from textract_extract.profiling import add_profile_arguments, profiler_from_args, write_profile_from_args
+from textract_extract.projection import projection_for
+from textract_extract.resume import add_resume_arguments, manifest_from_args
+
+# FORMS for the key-value pairs, TABLES for the line items
+INVOICE_FEATURES = ['FORMS', 'TABLES']
+
+# "forms": AnalyzeDocument(FORMS, TABLES), line items rebuilt from the tables
+# "expense": AnalyzeExpense, summary fields and line items read directly
+INVOICE_MODES = ("forms", "expense")
+
+
+def invoice_mode(mode=None):
+    """
+    Returns ``mode``, or TEXTRACT_INVOICE_MODE when it is None ("forms"
+    when that is not set either).
+    """
+    mode = (mode or os.getenv("TEXTRACT_INVOICE_MODE") or "forms").lower()
+    if mode not in INVOICE_MODES:
+        raise ValueError(f"unknown invoice mode '{mode}' (choose from {', '.join(INVOICE_MODES)})")
+    return mode
+
+
+def _is_expense(doc, mode):
+    # Fetched input is parsed as what it is, whatever the mode: a response dict
+    # by its shape, a BlockIndex as AnalyzeDocument blocks
+    if isinstance(doc, dict):
+        return "ExpenseDocuments" in doc
+    if isinstance(doc, BlockIndex):
+        return False
+    return invoice_mode(mode) == "expense"
+
+
+# --- Lazy Line-Item Extraction (script 4) ---
+def iter_line_items(doc, textract=None, cache=None, mode=None):
+    """
+    Yields an invoice's cleaned line items, table by table (or line-item
+    group by group with ``mode="expense"``).
+    ``doc`` may be a file path, raw bytes, an AnalyzeDocument or
+    AnalyzeExpense response or a BlockIndex.
+    """
+    if _is_expense(doc, mode):
+        response = get_response(doc, 'AnalyzeExpense', textract, cache, projection_for("expense"))
+        yield from METRICS.timed_iter("parse_tables", iter_expense_line_items(response))
+        return
+    blocks = as_index(get_blocks(doc, 'AnalyzeDocument', textract, cache, projection_for("invoice"),
+                                 FeatureTypes=INVOICE_FEATURES))
+    yield from METRICS.timed_iter("parse_tables", iter_table_line_items(blocks))
+
+
+def extract_invoice(doc, textract=None, cache=None, mode=None):
+    """
+    Returns the output4.json structure (extracted_data, needs_review,
+    line_items) for one invoice, from AnalyzeDocument(FORMS, TABLES) or,
+    with ``mode="expense"``, from a single AnalyzeExpense call.
+    """
+    if _is_expense(doc, mode):
+        response = get_response(doc, 'AnalyzeExpense', textract, cache, projection_for("expense"))
+        return parse_expense(response)
+    blocks = get_blocks(doc, 'AnalyzeDocument', textract, cache, projection_for("invoice"),
+                        FeatureTypes=INVOICE_FEATURES)
+    return parse_invoice(blocks)
+
+# --- Main Analysis Function (Silent, Generic, with Confidence Handling) ---
+def analyze_local_invoice(file_path, cache=None, writer=None, textract=None, mode=None):
+    """
+    Analyzes a local document silently, extracts ALL key-value pairs,
+    cleans them, and sorts by confidence.
+    Pass a ResponseCache to reuse earlier Textract responses for the same file,
+    and a JsonLinesWriter to stream one record per document instead of
+    writing output4.json. ``mode`` picks the API (see INVOICE_MODES).
+    Returns None, or the error when the document could not be processed.
+    """
+
+    try:
+        document = read_bytes(file_path)
+    except FileNotFoundError as e:
+        print(f"Error: File not found at '{file_path}'.")
+        return e
+
+    try:
+        # 5-7. Extract FORMS data (by confidence) and TABLE line items, or the expense fields
+        final_json_output = extract_invoice(document, textract, cache, mode)
+        
+        # 8. Stream one compact record, or save the final JSON to output4.json
+        if writer is not None:
+            writer.write({"document": file_path, **final_json_output})
+            print(f"Successfully streamed structured output to {writer.path}.")
+            return
+
+        output_filename = 'output4.json'
+        with METRICS.stage("write"), open(output_filename, 'w', encoding='utf-8') as f:
+            json.dump(final_json_output, f, indent=4)
+        
+        print(f"Successfully saved structured output to {output_filename}.")
+            
+    except Exception as e:
+        print(f"Error during Textract API call: {e}")
+        return e
+
+
+def main(argv=None):
+    # !! IMPORTANT: Change this to the path of your local invoice !!
+    local_file_path = "invoice.png"
+
+    parser = argparse.ArgumentParser(description="Extract structured data from invoices.")
+    parser.add_argument("files", nargs="*", default=[local_file_path], help="invoices to analyze")
+    parser.add_argument("--mode", choices=INVOICE_MODES, default=None,
+                        help="forms: AnalyzeDocument FORMS+TABLES; expense: AnalyzeExpense "
+                             "(default: TEXTRACT_INVOICE_MODE or forms)")
+    add_jsonl_arguments(parser)
+    add_resume_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics_from_args(args)
+    profiler = profiler_from_args(args)
+
+    if len(args.files) > 1 and not args.jsonl:
+        parser.error("several files need --jsonl (output4.json holds one document)")
+
+    mode = invoice_mode(args.mode)
+    operation = "expense" if mode == "expense" else "invoice"
+    writer = writer_from_args(args)
+    run_manifest = manifest_from_args(args, writer)
+    cache = ResponseCache.from_env()
+    failed = 0
+    try:
+        for file_path in args.files:
+            if run_manifest is not None and run_manifest.is_done(file_path, operation):
+                print(f"Skipping {file_path}: already done.")
+                continue
+            error = analyze_local_invoice(file_path, cache=cache, writer=writer, mode=mode)
+            failed += error is not None
+            if run_manifest is not None:
+                run_manifest.record(file_path, operation, args.jsonl or 'output4.json', error)
+    finally:
+        if writer is not None:
+            writer.close()
+        if run_manifest is not None:
+            run_manifest.close()
+    write_metrics_from_args(args)
+    write_profile_from_args(args, profiler, args.jsonl or 'output4.json')
+    return 1 if failed else 0
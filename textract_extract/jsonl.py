@@ -0,0 +1,170 @@
+import gzip
+import json
+import os
+import threading
+
+from textract_extract.metrics import METRICS
+
+DEFAULT_FSYNC_EVERY = 100   # Records between flush + fsync
+
+
+class JsonLinesWriter:
+    """
+    Streams one compact JSON record per line, appending to ``path``.
+
+    - ``compress=True`` writes gzip (each file/run is its own gzip member,
+      which ``gzip``/``zcat`` read back as one stream).
+    - ``max_bytes`` rotates to a new numbered file (results-00001.jsonl,
+      results-00002.jsonl, ...) once the current one holds that many bytes
+      of uncompressed JSON.
+    - Every ``fsync_every`` records the file is flushed and fsync'ed, so a
+      reader tailing it sees complete records without a sync per write.
+      Callbacks added with add_sync_callback() run after each such sync.
+
+    Safe to share between threads. Use as a context manager or call close().
+    """
+
+    def __init__(self, path, compress=False, max_bytes=None, fsync_every=DEFAULT_FSYNC_EVERY):
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.fsync_every = max(1, fsync_every)
+        self.records_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._raw = None
+        self._part = 0
+        self._bytes_in_file = 0
+        self._unsynced = 0
+        self._sync_callbacks = []
+
+    # --- File Handling ---
+    def _part_path(self, part):
+        if self.max_bytes is None:
+            return self.path
+        base, ext = self.path, ""
+        for suffix in (".gz", ".jsonl", ".json"):
+            if base.endswith(suffix):
+                base, ext = base[:-len(suffix)], suffix + ext
+        return f"{base}-{part:05d}{ext}"
+
+    def _open_next(self):
+        if self.max_bytes is not None:
+            if self._part == 0:
+                # Continue after the parts left by an earlier run instead of overwriting them
+                while os.path.exists(self._part_path(self._part + 1)):
+                    self._part += 1
+                if self._part == 0 or os.path.getsize(self._part_path(self._part)) >= self.max_bytes:
+                    self._part += 1
+            else:
+                self._part += 1
+        path = self._part_path(self._part)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._raw = open(path, "ab")
+        self._file = gzip.GzipFile(fileobj=self._raw, mode="ab") if self.compress else self._raw
+        self._bytes_in_file = 0 if self.compress else self._raw.tell()
+
+    def _sync(self):
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._unsynced = 0
+        self._synced()
+
+    def _synced(self):
+        for callback in self._sync_callbacks:
+            callback()
+
+    def _close_file(self):
+        if self._file is None:
+            return
+        if self._file is not self._raw:
+            self._file.close()   # Writes the gzip trailer; leaves _raw open
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        self._file = self._raw = None
+        self._unsynced = 0
+        self._synced()
+
+    # --- Public API ---
+    def write(self, record):
+        """
+        Appends one record as a single compact JSON line.
+        """
+        with METRICS.stage("write"):
+            line = (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+            with self._lock:
+                if self._file is None:
+                    self._open_next()
+                elif self.max_bytes is not None and self._bytes_in_file + len(line) > self.max_bytes \
+                        and self._bytes_in_file > 0:
+                    self._close_file()
+                    self._open_next()
+
+                self._file.write(line)
+                self._bytes_in_file += len(line)
+                self.records_written += 1
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every:
+                    self._sync()
+
+    def add_sync_callback(self, callback):
+        """
+        Calls ``callback()`` each time every record written so far is on
+        disk (after each periodic fsync, flush() and close()). It runs
+        under the writer's lock, so it must not write to this writer.
+        """
+        with self._lock:
+            self._sync_callbacks.append(callback)
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Shared Command-Line Options ---
+def add_jsonl_arguments(parser):
+    """
+    Adds the --jsonl/--gzip/--rotate-mb/--fsync-every options to a script.
+    """
+    parser.add_argument("--jsonl", help="stream one compact JSON record per result to this file")
+    parser.add_argument("--gzip", action="store_true", help="gzip the --jsonl output")
+    parser.add_argument("--rotate-mb", type=float, help="start a new --jsonl file every N MB")
+    parser.add_argument("--fsync-every", type=int, default=DEFAULT_FSYNC_EVERY,
+                        help="records between fsyncs of the --jsonl output")
+
+
+def writer_from_args(args):
+    """
+    Returns a JsonLinesWriter for the parsed options, or None without --jsonl.
+    """
+    if not args.jsonl:
+        return None
+    return JsonLinesWriter(
+        args.jsonl,
+        compress=args.gzip,
+        max_bytes=int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+        fsync_every=args.fsync_every,
+    )
@@ -0,0 +1,94 @@
+import argparse
+import os
+from contextlib import nullcontext
+
+from textract_extract.block_index import BlockIndex
+from textract_extract.cache import ResponseCache
+from textract_extract.documents import get_blocks, read_bytes
+from textract_extract.jsonl import add_jsonl_arguments, writer_from_args
+from textract_extract.metrics import METRICS, add_metrics_arguments, metrics_from_args, write_metrics_from_args
+from textract_extract.payload import FittedPayload, sniff_image
+from textract_extract.pdf_pages import DEFAULT_PAGE_WORKERS, format_pdf_lines, iter_pdf_lines
+from textract_extract.profiling import add_profile_arguments, profiler_from_args, write_profile_from_args
+from textract_extract.resume import add_resume_arguments, manifest_from_args
+from textract_extract.projection import projection_for
+
+
+# --- Lazy Line Extraction (scripts 1 and 2) ---
+def iter_lines(doc, textract=None, cache=None, max_workers=DEFAULT_PAGE_WORKERS):
+    """
+    Yields a document's LINEs as {'Page', 'Text'} dicts, in page order.
+
+    ``doc`` may be a file path, raw bytes, a DetectDocumentText response
+    or a BlockIndex. Multi-page PDFs are split and their pages sent
+    concurrently (see pdf_pages.py); images take one call. A PDF is split
+    before any size check, so only each page has to fit the sync limit.
+    """
+    if not isinstance(doc, (dict, BlockIndex)):
+        data = read_bytes(doc)
+        if sniff_image(data)[0] == "pdf":
+            yield from iter_pdf_lines(data, textract, max_workers)
+            return
+        if not isinstance(doc, FittedPayload):
+            doc = data
+
+    blocks = get_blocks(doc, "DetectDocumentText", textract, cache, projection_for("lines"))
+    if isinstance(blocks, BlockIndex):
+        blocks = blocks.of_type("LINE")
+    for block in blocks:
+        if block["BlockType"] == "LINE":
+            yield {"Page": block.get("Page", 1), "Text": block["Text"]}
+
+
+def extract_lines(file_path, output_file, textract=None, cache=None, max_workers=DEFAULT_PAGE_WORKERS):
+    """
+    Extracts a document's lines and saves them as text (page headers are
+    added for multi-page PDFs).
+    """
+    lines = list(iter_lines(file_path, textract, cache, max_workers))
+    with METRICS.stage("write"), open(output_file, "w", encoding="utf-8") as f:
+        f.write(format_pdf_lines(lines))
+
+    print(f"Text extraction complete and saved to {output_file}")
+
+
+def main(argv=None, file_path="sample.png", output_file="Output2.txt", output_dir="output2",
+         description="Basic synchronous OCR with DetectDocumentText."):
+    """
+    Command line for scripts 1 and 2: one file by default, or batch mode
+    over a directory / glob / manifest.
+    """
+    from textract_extract.batch import DEFAULT_WORKERS, run_detect_batch
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("source", nargs="?", help="batch mode: a directory, glob pattern or manifest of files")
+    parser.add_argument("--output-dir", default=output_dir, help="batch mode: where to write one .txt per input")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="batch mode: concurrent Textract calls")
+    parser.add_argument("--page-workers", type=int, default=DEFAULT_PAGE_WORKERS, help="concurrent pages per PDF")
+    add_jsonl_arguments(parser)
+    add_resume_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics_from_args(args)
+    profiler = profiler_from_args(args)
+
+    try:
+        if args.source:
+            # Batch mode: one output file (or JSON line) per input, processed concurrently
+            with writer_from_args(args) or nullcontext() as writer, \
+                    manifest_from_args(args, writer) or nullcontext() as run_manifest:
+                failed = run_detect_batch(args.source, args.output_dir, args.workers, writer, run_manifest)
+            return 1 if failed else 0
+
+        extract_lines(file_path, output_file, cache=ResponseCache.from_env(), max_workers=args.page_workers)
+    except Exception as e:
+        # Throttles and 5xx were already retried (see retry.py)
+        print(f"Error during Textract API call: {e}")
+        return 1
+    finally:
+        write_metrics_from_args(args)
+        # Reports go next to the outputs: beside the .txt / --jsonl file, or inside --output-dir
+        batch_output = args.jsonl or os.path.join(args.output_dir, "")
+        write_profile_from_args(args, profiler, batch_output if args.source else output_file)
+    return 0
@@ -0,0 +1,301 @@
+import bisect
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# --- Histogram Buckets ---
+LATENCY_BUCKETS = (0.00001, 0.0001, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)   # Seconds
+BYTES_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 ** 2, 2 * 1024 ** 2,
+                 5 * 1024 ** 2, 10 * 1024 ** 2)        # Sync API payloads top out at 10 MB
+
+# Metric name -> HELP line of the Prometheus exposition
+METRIC_HELP = {
+    "textract_stage_seconds": "Time spent in each pipeline stage (read, index, key_values, parse_tables, ...).",
+    "textract_call_seconds": "Latency of each Textract API attempt.",
+    "textract_payload_bytes": "Document bytes uploaded per Textract API attempt.",
+    "textract_blocks_total": "Blocks returned by Textract, by BlockType.",
+    "textract_retry_events_total": "Calls, retries and errors seen by the retry layer, by kind.",
+}
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus style) that also tracks min/max.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """
+        Estimates the q-quantile by interpolating inside its bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = max(self.buckets[i - 1] if i else 0.0, self.min)
+                upper = min(self.buckets[i] if i < len(self.buckets) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+# --- Registry ---
+class Metrics:
+    """
+    Process-wide counters and histograms keyed by (name, labels).
+
+    Disabled by default: every recording method returns at once and
+    ``stage()`` hands back a shared no-op context, so the hooks left in the
+    pipeline cost effectively nothing until ``enable()`` is called.
+
+    The same stage hooks drive ``profiler`` (a profiling.StageProfiler)
+    when one is attached, with or without metrics enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profiler = None
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # --- Recording ---
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def stage(self, name):
+        """
+        Context manager that times one pipeline stage.
+        """
+        if not self.enabled and self.profiler is None:
+            return _NULL_CONTEXT
+        return self._timed_stage(name)
+
+    @contextmanager
+    def _timed_stage(self, name):
+        profiler = self.profiler
+        token = profiler.start(name) if profiler is not None else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.stop(name, token)
+            self.observe("textract_stage_seconds", elapsed, stage=name)
+
+    def timed_iter(self, name, iterable):
+        """
+        Yields from ``iterable`` and records the time spent producing its
+        items (not the time the consumer holds them) as one stage sample.
+        """
+        profiler = self.profiler
+        if not self.enabled and profiler is None:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                token = profiler.start(name) if profiler is not None else None
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                    if profiler is not None:
+                        profiler.stop(name, token)
+                yield item
+        finally:
+            self.observe("textract_stage_seconds", elapsed, stage=name)
+
+    def timed(self, function, name):
+        """
+        Returns ``function`` timed as stage ``name`` on every call (the
+        function itself while disabled).
+        """
+        if not self.enabled:
+            return function
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe("textract_stage_seconds", time.perf_counter() - start, stage=name)
+        return wrapper
+
+    def instrument_call(self, call, operation, params):
+        """
+        Wraps a Textract client method so each attempt records its latency,
+        the uploaded bytes and the returned blocks by BlockType.
+        """
+        if not self.enabled:
+            return call
+        features = ",".join(sorted(params.get("FeatureTypes", ()))) or "none"
+
+        def instrumented(**kwargs):
+            self.observe("textract_payload_bytes", len(kwargs["Document"]["Bytes"]),
+                         BYTES_BUCKETS, operation=operation)
+            start = time.perf_counter()
+            response = call(**kwargs)
+            self.observe("textract_call_seconds", time.perf_counter() - start,
+                         operation=operation, features=features)
+            block_types = Counter(block["BlockType"] for block in response.get("Blocks", ()))
+            for block_type, count in block_types.items():
+                self.inc("textract_blocks_total", count, operation=operation, block_type=block_type)
+            return response
+        return instrumented
+
+    # --- Export ---
+    def to_prometheus(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            describe(name, "histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels, le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """
+        Returns a JSON-ready summary: per-histogram count/sum/mean/min/max
+        and p50/p95/p99 estimates, and every counter's value.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        result = {"histograms": {}, "counters": {}}
+        for (name, labels), histogram in histograms:
+            result["histograms"].setdefault(name, []).append({"labels": dict(labels), **histogram.summary()})
+        for (name, labels), value in counters:
+            result["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def write(self, prometheus_path=None, json_path=None):
+        if prometheus_path:
+            with open(prometheus_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+        if json_path:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, indent=4)
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + [(k, v) for k, v in extra.items()]
+    if not pairs:
+        return ""
+    escaped = (k + '="' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+# The registry every module records into
+METRICS = Metrics()
+
+
+# --- Command Line ---
+def add_metrics_arguments(parser):
+    """
+    Adds the --metrics/--metrics-prom options to a script.
+    """
+    parser.add_argument("--metrics", help="write a JSON summary of per-stage metrics to this file at the end")
+    parser.add_argument("--metrics-prom", help="write the metrics in Prometheus text format to this file")
+
+
+def metrics_from_args(args):
+    """
+    Turns metrics on when either metrics option was given.
+    """
+    if args.metrics or args.metrics_prom:
+        METRICS.enable()
+
+
+def write_metrics_from_args(args):
+    """
+    Writes the requested metrics files (call once the run is done).
+    """
+    if args.metrics or args.metrics_prom:
+        METRICS.write(prometheus_path=args.metrics_prom, json_path=args.metrics)
+        print(f"Metrics saved to {', '.join(p for p in (args.metrics, args.metrics_prom) if p)}", file=sys.stderr)
@@ -0,0 +1,278 @@
+import datetime
+import functools
+import re
+
+DEFAULT_CACHE_SIZE = 8192   # Distinct strings remembered per normalizer
+
+# Currency symbols and ISO codes stripped before parsing an amount
+CURRENCY_SYMBOLS = "$€£¥₹৳₩₽₺₦"
+CURRENCY_CODES = ("BDT", "USD", "EUR", "GBP", "INR", "JPY", "CNY", "CAD", "AUD", "CHF")
+
+_CURRENCY = re.compile(
+    "[" + re.escape(CURRENCY_SYMBOLS) + "]|(?<![A-Za-z])(?:" + "|".join(CURRENCY_CODES) + ")(?![A-Za-z])"
+)
+
+# sign, optional "(" for accounting negatives, the digits with their
+# separators (a plain "5." or "5," is a whole number), optional ")"
+# and a trailing minus (e.g. "1,234.50-")
+_AMOUNT = re.compile(
+    r"(?P<sign>[-+])?\s*(?P<open>\()?\s*"
+    r"(?P<number>\d+(?:[.,]\d+)*|\d+[.,]|[.,]\d+|\d{1,3}(?:[ '\u00a0\u202f]\d{3})+(?:[.,]\d+)?)"
+    r"\s*(?P<close>\))?\s*(?P<trailing>-)?"
+)
+_HAS_DIGIT = re.compile(r"\d").search
+_HAS_LOWERCASE = re.compile(r"[a-z]").search   # Never part of an amount; "Item 1 total" is text
+_SPACE_GROUPS = str.maketrans("", "", " '\u00a0\u202f")
+# Whole-number part with thousands separators: 1,234,567 or Indian 12,34,567
+_GROUPED = {
+    separator: re.compile(rf"\d{{1,3}}(?:{re.escape(separator)}\d{{3}})+|\d{{1,2}}(?:{re.escape(separator)}\d{{2}})+{re.escape(separator)}\d{{3}}")
+    for separator in ",."
+}
+_DOT_GROUPED = re.compile(r"\d{1,3}(?:\.\d{3}){2,}")
+
+# A whole column of "12" / "-3.50" / "$1,234.56" / "" cells joined by "\n",
+# checked in one pass so clean_column can convert it in bulk
+_SIMPLE_CELL = (
+    r"[ \t]*(?:(?:-[" + re.escape(CURRENCY_SYMBOLS) + r"]?|[" + re.escape(CURRENCY_SYMBOLS) + r"]?-?)"
+    r" ?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)?[ \t]*"
+)
+_SIMPLE_COLUMN = re.compile(f"(?:{_SIMPLE_CELL}\n)*{_SIMPLE_CELL}")
+_COLUMN_NOISE = tuple(CURRENCY_SYMBOLS) + (",", " ", "\t")
+
+# --- Dates ---
+_MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+    ), start=1)
+    for name in names
+}
+_MONTH_NAME = "(?P<month_name>" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_ISO_DATE = re.compile(r"(?P<year>\d{4})[-/.](?P<month>\d{1,2})[-/.](?P<day>\d{1,2})")
+_NUMERIC_DATE = re.compile(r"(?P<a>\d{1,2})(?P<sep>[-/.])(?P<b>\d{1,2})(?P=sep)(?P<year>\d{4}|\d{2})")
+_MONTH_FIRST_DATE = re.compile(_MONTH_NAME + r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})", re.I)
+_DAY_FIRST_DATE = re.compile(r"(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+" + _MONTH_NAME + r",?\s+(?P<year>\d{4})", re.I)
+
+
+def parse_amount(text, decimal=None):
+    """
+    Parses a money/quantity string such as "$1,234.56", "1.234,56 €",
+    "1 234,56", "(45.00)" or "BDT 500" into an int or float. Returns None
+    when the text is not a single amount.
+
+    ``decimal`` is the decimal separator ("." or ","). Left as None it is
+    inferred: with both separators present the last one is the decimal
+    point; a lone "," is a thousands separator only when it groups digits
+    in threes (1,234), and a lone "." only when it repeats (1.234.567).
+    """
+    if decimal != ",":
+        amount = _simple_amount(text)
+        if amount is not None:
+            return amount
+    return _parse_amount(text, decimal)
+
+
+def _parse_amount(text, decimal):
+    # Full parser: currency codes, decimal commas, space/apostrophe grouping,
+    # parenthesised and trailing-minus negatives
+    if _HAS_LOWERCASE(text):
+        return None
+    match = _AMOUNT.fullmatch(_CURRENCY.sub("", text).strip())
+    if match is None:
+        return None
+    number = match.group("number")
+    if (match.group("open") is None) != (match.group("close") is None):
+        return None   # Unbalanced parenthesis
+
+    if not number.isdigit():
+        number = number.translate(_SPACE_GROUPS).rstrip(".,")
+    separator = decimal or _decimal_separator(number)
+    whole, fraction = number, ""
+    if separator and separator in number:
+        whole, _, fraction = number.rpartition(separator)
+    # The other separator may only group thousands in the whole part
+    thousands = "." if separator == "," or (separator is None and "," not in whole) else ","
+    if thousands in whole:
+        if not _GROUPED[thousands].fullmatch(whole):
+            return None   # e.g. "01.02.2019" read with decimal commas
+        whole = whole.replace(thousands, "")
+    if not (whole + fraction).isdecimal():
+        return None
+    number = f"{whole or 0}.{fraction}" if fraction else whole
+
+    if match.group("sign") == "-" or match.group("open") is not None or match.group("trailing") is not None:
+        number = "-" + number
+    return _to_number(number)
+
+
+def _simple_amount(text):
+    # The usual shapes ("12", "-3.50", "$1,234.56", "-$45") with plain str
+    # methods, which are several times cheaper than a regex match; None
+    # sends anything else down the full parser
+    whole, dot, fraction = text.partition(".")
+    if not whole.isdecimal():
+        sign = ""
+        if whole[:1] == "-":
+            sign, whole = "-", whole[1:]
+        if whole[:1] in CURRENCY_SYMBOLS:
+            whole = whole[1:].lstrip()
+            if not sign and whole[:1] == "-":
+                sign, whole = "-", whole[1:]
+        if "," in whole:
+            # Only thousands commas here; "12,5" is left to the full parser
+            if not _GROUPED[","].fullmatch(whole):
+                return None
+            whole = whole.replace(",", "")
+        if not whole.isdecimal():
+            return None
+        whole = sign + whole
+    if not dot or not fraction:
+        return int(whole)   # Exact, even past float precision; "5." is 5
+    if not fraction.isdecimal():
+        return None
+    value = float(whole + dot + fraction)
+    return int(value) if value.is_integer() else value
+
+
+def _to_number(number):
+    if "." not in number:
+        return int(number)   # Exact, even past float precision
+    value = float(number)
+    return int(value) if value.is_integer() else value
+
+
+def _decimal_separator(number):
+    last_dot = number.rfind(".")
+    last_comma = number.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        return "." if last_dot > last_comma else ","
+    if last_comma >= 0:
+        return None if _GROUPED[","].fullmatch(number) else ","
+    if last_dot >= 0:
+        return None if _DOT_GROUPED.fullmatch(number) else "."
+    return None
+
+
+def parse_date(text, dayfirst=False):
+    """
+    Parses "2023-10-26", "10/26/2023", "26.10.2023", "Oct 26, 2023" or
+    "26 October 2023" into a datetime.date, or returns None.
+
+    All-numeric dates are read month first unless ``dayfirst`` is set or
+    the first number cannot be a month; dotted dates (26.10.2023) are
+    day first whenever the second number can be a month.
+    """
+    text = text.strip()
+    match = _ISO_DATE.fullmatch(text)
+    if match:
+        return _make_date(match.group("year"), match.group("month"), match.group("day"))
+
+    match = _NUMERIC_DATE.fullmatch(text)
+    if match:
+        a, b = int(match.group("a")), int(match.group("b"))
+        if a > 12 or (b <= 12 and (dayfirst or match.group("sep") == ".")):
+            a, b = b, a
+        return _make_date(match.group("year"), a, b)
+
+    match = _MONTH_FIRST_DATE.fullmatch(text) or _DAY_FIRST_DATE.fullmatch(text)
+    if match:
+        return _make_date(match.group("year"), _MONTHS[match.group("month_name").lower()], match.group("day"))
+    return None
+
+
+def _make_date(year, month, day):
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+    try:
+        return datetime.date(year, int(month), int(day))
+    except ValueError:
+        return None
+
+
+# --- Memoized Normalizer ---
+class ValueNormalizer:
+    """
+    Turns raw Textract strings into typed values: amounts become int/float
+    (see parse_amount) and, with ``parse_dates``, dates become ISO
+    "YYYY-MM-DD" strings. Anything else comes back stripped.
+
+    Results are memoized per distinct string in a bounded LRU, since
+    invoices repeat the same tokens ("1", "$0.00", "Each", "USD") over and
+    over. The cache is safe to share between threads.
+    """
+
+    def __init__(self, decimal=None, dayfirst=False, parse_dates=False, cache_size=DEFAULT_CACHE_SIZE):
+        if decimal not in (None, ".", ","):
+            raise ValueError(f"decimal must be '.', ',' or None, not {decimal!r}")
+        self.decimal = decimal
+        self.dayfirst = dayfirst
+        self.parse_dates = parse_dates
+        self._clean_text = functools.lru_cache(maxsize=cache_size)(self._normalize)
+
+    def clean(self, value):
+        """
+        Normalizes one value (None stays None; non-strings are str()-ed).
+        """
+        if value is None:
+            return None
+        return self._clean_text(value if isinstance(value, str) else str(value))
+
+    def clean_column(self, values):
+        """
+        Normalizes a whole column of values at once and returns a list.
+
+        A column made only of plain amounts ("12", "$1,234.56", blanks) is
+        validated with one regex pass over the joined column and converted
+        in bulk; any other column is cleaned value by value.
+        """
+        values = list(values)
+        if self.decimal != "," and values:
+            try:
+                joined = "\n".join(values)
+            except TypeError:
+                joined = None   # None or non-string cells
+            if joined is not None and _SIMPLE_COLUMN.fullmatch(joined):
+                for noise in _COLUMN_NOISE:
+                    if noise in joined:
+                        joined = joined.replace(noise, "")
+                parts = joined.split("\n")
+                if len(parts) == len(values):   # No cell had its own newline
+                    return [_to_number(part) if part else part for part in parts]
+
+        clean_text = self._clean_text
+        return [
+            None if value is None else clean_text(value if isinstance(value, str) else str(value))
+            for value in values
+        ]
+
+    def cache_info(self):
+        return self._clean_text.cache_info()
+
+    def cache_clear(self):
+        self._clean_text.cache_clear()
+
+    def _normalize(self, text):
+        text = text.strip()
+        if self.decimal != ",":
+            amount = _simple_amount(text)
+            if amount is not None:
+                return amount
+        # No digit means no amount or date; skips the parsers entirely
+        if not _HAS_DIGIT(text):
+            return text
+
+        amount = _parse_amount(text, self.decimal)
+        if amount is not None:
+            return amount
+        if self.parse_dates:
+            date = parse_date(text, self.dayfirst)
+            if date is not None:
+                return date.isoformat()
+        return text
+
+
+# Shared by clean_value() and the parsers
+DEFAULT_NORMALIZER = ValueNormalizer()
@@ -0,0 +1,120 @@
+import marshal
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from textract_extract.documents import get_response
+from textract_extract.invoice import INVOICE_FEATURES, invoice_mode
+from textract_extract.metrics import METRICS
+from textract_extract.parsers import parse_expense, parse_invoice, parse_key_values, parse_table_blocks
+from textract_extract.projection import projection_for
+
+
+# --- Transfer Format ---
+def pack_response(response):
+    """
+    Serializes a (projected) response for a parse worker.
+
+    marshal writes plain dicts, lists, strings and numbers about twice as
+    fast as pickle (and far faster than JSON), which matters because the
+    packing runs in the parent, the process the pool is there to relieve.
+    Both sides run the same interpreter, so its format is always readable.
+    """
+    return marshal.dumps(response)
+
+
+def unpack_response(payload):
+    return marshal.loads(payload)
+
+
+# --- Worker Side ---
+def _forms(response):
+    return {"pairs": parse_key_values(response["Blocks"])}
+
+
+def _invoice(response):
+    return parse_invoice(response["Blocks"])
+
+
+def _tables(response):
+    return {"tables": parse_table_blocks(response["Blocks"])}
+
+
+# Operation -> (Textract API, request parameters, parser returning the record
+# fields). The records match cli.OPERATIONS; "lines" stays in-process, as
+# PDFs are split per page and LINE parsing is trivial.
+PARSE_OPERATIONS = {
+    "forms": ("AnalyzeDocument", {"FeatureTypes": ["FORMS"]}, _forms),
+    "invoice": ("AnalyzeDocument", {"FeatureTypes": INVOICE_FEATURES}, _invoice),
+    "expense": ("AnalyzeExpense", {}, parse_expense),
+    "tables": ("AnalyzeDocument", {"FeatureTypes": ["TABLES"]}, _tables),
+}
+
+
+def _parse_packed(operation, payload):
+    return PARSE_OPERATIONS[operation][2](unpack_response(payload))
+
+
+# --- Parse Pool ---
+class ParsePool:
+    """
+    Parses Textract responses on worker processes, so the CPU-bound block
+    walking and value cleaning of a large batch use every core instead of
+    queuing behind the GIL of the process that makes the API calls.
+
+    Responses are projected (see projection.py) and packed with marshal
+    before they cross the process boundary; only the parsed records come
+    back. Stage metrics of the parsing itself stay in the workers.
+
+    Usage:
+        with ParsePool(4) as pool:
+            for fields in pool.map("tables", responses):
+                ...
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def submit(self, operation, response):
+        """
+        Sends one fetched response to a worker; returns a Future of its
+        record fields.
+        """
+        with METRICS.stage("pack"):
+            payload = pack_response(response)
+        return self._executor.submit(_parse_packed, operation, payload)
+
+    def fetch_and_submit(self, operation, doc, textract=None, cache=None):
+        """
+        Calls Textract for ``doc`` in the calling thread, then hands the
+        response to a worker. Returns a Future of the record fields.
+        """
+        if operation == "invoice" and invoice_mode() == "expense":
+            operation = "expense"
+        api, params, _ = PARSE_OPERATIONS[operation]
+        response = get_response(doc, api, textract, cache, projection_for(operation), **params)
+        return self.submit(operation, response)
+
+    def map(self, operation, responses):
+        """
+        Parses already-fetched responses and yields their record fields in
+        input order. At most ``2 * max_workers`` are in flight at once.
+        """
+        window = 2 * self.max_workers
+        pending = deque()
+        for response in responses:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(self.submit(operation, response))
+        while pending:
+            yield pending.popleft().result()
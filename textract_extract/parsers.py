@@ -0,0 +1,367 @@
+from textract_extract.block_index import WORD_TYPES, BlockIndex, as_index
+from textract_extract.headers import get_header_normalizer, snake_case
+from textract_extract.metrics import METRICS
+from textract_extract.normalize import DEFAULT_NORMALIZER
+
+# --- Confidence Thresholds (invoice) ---
+CONFIDENCE_PRIMARY = 95.0  # >= 95% -> Clean and add to main data
+CONFIDENCE_REVIEW = 70.0   # >= 70% -> Add to "needs_review" list
+                           # < 70%  -> Discard
+
+
+# --- Helper Function 1: Data Cleaning & Type-Casting ---
+def clean_value(text_value):
+    """
+    Cleans a string value, removes currency symbols and thousands
+    separators, and casts amounts to an integer or float.
+    See normalize.ValueNormalizer; repeated strings are served from its cache.
+    """
+    return DEFAULT_NORMALIZER.clean(text_value)
+
+# --- Helper Function 2: Normalize Table Headers ---
+def normalize_header(header):
+    """
+    Maps a header cell's text to a line-item field name
+    (e.g., "Unit Price" -> "unit_price", "Total Price" -> "line_total").
+    See headers.HeaderNormalizer.
+    """
+    return get_header_normalizer().field(header)
+
+# --- Helper Function 3: Parse One Table's Line Items (with cleaning) ---
+def parse_line_item_table(index, table, normalizer=DEFAULT_NORMALIZER):
+    """
+    Builds one TABLE's row/column grid from its own CHILD cells (one pass
+    over its cells) and returns its rows as item dictionaries, each column
+    cleaned in one batch by ``normalizer``.
+    Row 1 is the header row; tables without one yield no items.
+    """
+    rows = {}
+    for cell in index.child_blocks(table['Id']):
+        if cell['BlockType'] != 'CELL':
+            continue
+        row = rows.get(cell['RowIndex'])
+        if row is None:
+            row = rows[cell['RowIndex']] = {}
+        row[cell['ColumnIndex']] = index.text(cell['Id'])
+
+    if 1 not in rows:
+        return [] # No header row
+
+    # Two headers of one field ("Item Code", "Code") keep both columns: the first gets the field
+    columns = sorted(rows[1])
+    headers = dict(zip(columns, get_header_normalizer().unique_fields([rows[1][col] for col in columns])))
+    body = [rows[r_idx] for r_idx in sorted(rows.keys()) if r_idx != 1]  # Skip header row
+
+    # Auto-clean every value from the table, one column at a time
+    clean_column = METRICS.timed(normalizer.clean_column, "clean_value")
+    columns = {
+        c_idx: iter(clean_column([row[c_idx] for row in body if c_idx in row]))
+        for c_idx in headers
+    }
+
+    # Build the list of item dictionaries
+    items_list = []
+    for row in body:
+        item_dict = {}
+        for c_idx in sorted(row.keys()):
+            key = headers.get(c_idx)
+            if key is not None:
+                item_dict[key] = next(columns[c_idx])
+
+        # Only add non-empty rows
+        if item_dict:
+            items_list.append(item_dict)
+
+    return items_list
+
+# --- Helper Function 4: Parse Table Data (every table) ---
+def iter_table_line_items(blocks, normalizer=DEFAULT_NORMALIZER):
+    """
+    Yields every TABLE's line items, in table order, one table at a time.
+    Each table is parsed from its own cells with its own headers, so rows
+    from different tables are never merged.
+    """
+    index = as_index(blocks)
+    for table in index.of_type('TABLE'):
+        yield from parse_line_item_table(index, table, normalizer)
+
+def parse_tables(blocks, normalizer=DEFAULT_NORMALIZER):
+    """
+    Parses every TABLE block and returns all tables' line items as a list.
+    """
+    return list(iter_table_line_items(blocks, normalizer))
+
+
+# --- FORMS: Key-Value Pairs (script 3) ---
+def iter_key_value_pairs(blocks):
+    """
+    Yields every KEY block's text, its VALUE text and the KEY confidence
+    as {'key', 'value', 'confidence'} dicts.
+    ``blocks`` may be the raw Blocks list or a shared BlockIndex.
+    """
+    index = as_index(blocks)
+
+    # Traverse KEY blocks to find key-value pairs
+    for block in index.keys:
+        key_text = index.text(block["Id"], "", WORD_TYPES)
+        value_text = "".join(
+            index.text(value_id, "", WORD_TYPES)
+            for value_id in index.value_ids.get(block["Id"], ())
+        )
+
+        if key_text or value_text:
+            yield {
+                "key": key_text,
+                "value": value_text,
+                "confidence": block["Confidence"],
+            }
+
+
+def parse_key_values(blocks):
+    """
+    Returns every key-value pair as a list (see iter_key_value_pairs).
+    """
+    return list(iter_key_value_pairs(blocks))
+
+
+def format_key_value(pair):
+    """
+    Formats one key-value pair the way output3.txt shows it.
+    """
+    return f"Key: {pair['key']} -> Value: {pair['value']} (Confidence: {pair['confidence']:.1f}%)"
+
+
+# --- QUERIES: Targeted Fields (script 3, --queries) ---
+def iter_query_answers(blocks):
+    """
+    Yields one {'key', 'value', 'confidence'} dict per QUERY block, in the
+    order the queries were sent. The key is the query's Alias (or its
+    question), the value its most confident QUERY_RESULT. Unanswered
+    queries get an empty value and 0 confidence.
+    Only the QUERY blocks are visited; KEY_VALUE_SETs are never walked.
+    """
+    index = as_index(blocks)
+
+    for query in index.of_type("QUERY"):
+        question = query.get("Query", {})
+        best = max(index.answers(query["Id"]), key=lambda result: result.get("Confidence", 0.0), default=None)
+        yield {
+            "key": question.get("Alias") or question.get("Text", ""),
+            "value": best.get("Text", "") if best else "",
+            "confidence": best.get("Confidence", 0.0) if best else 0.0,
+        }
+
+
+def parse_query_answers(blocks):
+    """
+    Returns every query's answer as a list (see iter_query_answers).
+    """
+    return list(iter_query_answers(blocks))
+
+
+# --- Invoice: FORMS + TABLES (script 4) ---
+def parse_invoice(blocks, normalizer=DEFAULT_NORMALIZER):
+    """
+    Extracts ALL key-value pairs, cleans them, sorts them by confidence and
+    parses the line-item table. Returns the output4.json structure.
+    ``blocks`` may be the raw Blocks list or a shared BlockIndex;
+    ``normalizer`` (a normalize.ValueNormalizer) sets the number/date locale.
+    """
+    index = as_index(blocks)
+    clean = METRICS.timed(normalizer.clean, "clean_value")
+
+    # Extract and process all FORMS data
+    extracted_data = {}
+    needs_review = []
+
+    with METRICS.stage("key_values"):
+        for key_block in index.keys:
+            value_block = index.value_of(key_block['Id'])
+
+            if value_block:
+                key_text = index.text(key_block['Id'])
+                val_text = index.text(value_block['Id'])
+
+                # Use the average confidence of the key-value pair
+                avg_confidence = (key_block['Confidence'] + value_block['Confidence']) / 2
+
+                if avg_confidence >= CONFIDENCE_PRIMARY:
+                    # High confidence: clean and add to main data
+                    extracted_data[key_text] = clean(val_text)
+
+                elif avg_confidence >= CONFIDENCE_REVIEW:
+                    # Medium confidence: add to review list
+                    needs_review.append({
+                        'key': key_text,
+                        'value': val_text,
+                        'confidence': round(avg_confidence, 2)
+                    })
+                # Else: (avg_confidence < CONFIDENCE_REVIEW) -> Discard silently
+
+    # Extract TABLE data
+    with METRICS.stage("parse_tables"):
+        line_items = parse_tables(index, normalizer)
+
+    return {
+        "extracted_data": extracted_data,
+        "needs_review": needs_review,
+        "line_items": line_items
+    }
+
+
+# --- Invoice: AnalyzeExpense (script 4, --mode expense) ---
+# Line-item field Types -> the field names the table headers map to.
+# EXPENSE_ROW (the whole row's text) is skipped; OTHER goes by its label.
+EXPENSE_LINE_ITEM_FIELDS = {
+    "ITEM": "description",
+    "PRODUCT_CODE": "item_code",
+    "QUANTITY": "quantity",
+    "UNIT_PRICE": "unit_price",
+    "PRICE": "line_total",
+}
+
+
+def _expense_key(field):
+    # The printed label ("Invoice No.") when there is one, else the Type ("VENDOR_NAME")
+    label = field.get('LabelDetection')
+    if label and label.get('Text'):
+        return label['Text'], label.get('Confidence', 0.0)
+    kind = field.get('Type', {})
+    return kind.get('Text', ''), kind.get('Confidence', 0.0)
+
+
+def iter_expense_line_items(response, normalizer=DEFAULT_NORMALIZER):
+    """
+    Yields the cleaned line items of an AnalyzeExpense response, in
+    document, group and row order. Fields are named like the table
+    headers of parse_tables ("description", "quantity", ...).
+    """
+    header_field = get_header_normalizer().field
+    clean = METRICS.timed(normalizer.clean, "clean_value")
+
+    for document in response.get('ExpenseDocuments', ()):
+        for group in document.get('LineItemGroups', ()):
+            for line_item in group.get('LineItems', ()):
+                item_dict = {}
+                for field in line_item.get('LineItemExpenseFields', ()):
+                    kind = field.get('Type', {}).get('Text')
+                    key = EXPENSE_LINE_ITEM_FIELDS.get(kind)
+                    label = field.get('LabelDetection', {}).get('Text')
+                    if key is None:
+                        if kind != 'OTHER' or not label:
+                            continue
+                        key = header_field(label)
+                    if key in item_dict and label:
+                        key = snake_case(label)   # The first field of a name keeps it
+                    if key not in item_dict:
+                        item_dict[key] = clean(field.get('ValueDetection', {}).get('Text', ''))
+
+                # Only add non-empty rows
+                if item_dict:
+                    yield item_dict
+
+
+def parse_expense(response, normalizer=DEFAULT_NORMALIZER):
+    """
+    Returns the output4.json structure for an AnalyzeExpense response.
+
+    SummaryFields are sorted into extracted_data / needs_review with the
+    same confidence tiers as parse_invoice (the average of the label and
+    value confidence), and LineItemGroups become line_items. No block
+    graph is indexed or walked.
+    """
+    clean = METRICS.timed(normalizer.clean, "clean_value")
+
+    extracted_data = {}
+    needs_review = []
+
+    with METRICS.stage("key_values"):
+        for document in response.get('ExpenseDocuments', ()):
+            for field in document.get('SummaryFields', ()):
+                value = field.get('ValueDetection')
+                if not value:
+                    continue
+                key_text, key_confidence = _expense_key(field)
+                val_text = value.get('Text', '')
+                avg_confidence = (key_confidence + value.get('Confidence', 0.0)) / 2
+
+                if avg_confidence >= CONFIDENCE_PRIMARY:
+                    extracted_data[key_text] = clean(val_text)
+                elif avg_confidence >= CONFIDENCE_REVIEW:
+                    needs_review.append({
+                        'key': key_text,
+                        'value': val_text,
+                        'confidence': round(avg_confidence, 2)
+                    })
+
+    with METRICS.stage("parse_tables"):
+        line_items = list(iter_expense_line_items(response, normalizer))
+
+    return {
+        "extracted_data": extracted_data,
+        "needs_review": needs_review,
+        "line_items": line_items
+    }
+
+
+# --- TABLES with Metadata (script 5) ---
+def iter_table_blocks(blocks):
+    """
+    Yields every TABLE with its type, title, footer, header-row fields and
+    sorted cells, in the output5.json structure, one table at a time as it
+    is parsed.
+    ``blocks`` may be the raw Blocks list or a shared BlockIndex.
+    """
+    index = as_index(blocks)
+    unique_fields = get_header_normalizer().unique_fields
+
+    for idx, table in enumerate(index.of_type('TABLE'), start=1):
+        table_type = table.get('TableType', 'STANDARD')
+        title = table.get('Title', {}).get('Text', '')
+        footer = table.get('Footer', {}).get('Text', '')
+
+        # Extract rows & cells
+        rows = []
+        for cell in index.child_blocks(table['Id']):
+            if cell['BlockType'] == 'CELL':
+                rows.append({
+                    "RowIndex": cell['RowIndex'],
+                    "ColumnIndex": cell['ColumnIndex'],
+                    "Text": index.text(cell['Id'])
+                })
+
+        # Sort by row and column
+        rows_sorted = sorted(rows, key=lambda x: (x['RowIndex'], x['ColumnIndex']))
+
+        # Row 1 is the header row, mapped to the same fields as script 4's line items
+        header_cells = [cell for cell in rows_sorted if cell['RowIndex'] == 1]
+        fields = unique_fields([cell['Text'] for cell in header_cells])
+        columns = [
+            {"ColumnIndex": cell['ColumnIndex'], "Header": cell['Text'], "Field": field}
+            for cell, field in zip(header_cells, fields)
+        ]
+        yield {
+            "TableNumber": idx,
+            "Type": table_type,
+            "Title": title,
+            "Footer": footer,
+            "Columns": columns,
+            "Cells": rows_sorted
+        }
+
+
+def parse_table_blocks(blocks):
+    """
+    Returns every TABLE in the output5.json structure (see iter_table_blocks).
+    """
+    return list(iter_table_blocks(blocks))
+
+
+# --- DetectDocumentText (scripts 1 and 2) ---
+def parse_lines(blocks):
+    """
+    Returns the text of every LINE block, in reading order.
+    """
+    if isinstance(blocks, BlockIndex):
+        return [block["Text"] for block in blocks.of_type("LINE")]
+    return [block["Text"] for block in blocks if block["BlockType"] == "LINE"]
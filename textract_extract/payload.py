@@ -0,0 +1,198 @@
+import io
+import struct
+from dataclasses import dataclass, field
+
+# --- Synchronous API Limits ---
+MAX_SYNC_BYTES = 10 * 1024 * 1024   # Document.Bytes limit for the sync operations
+MAX_DIMENSION = 10000               # Max width / height in pixels
+MIN_LONG_EDGE = 1600                # OCR floor: never downscale below this (~150 DPI letter page)
+JPEG_QUALITY = 90
+MIN_SAVINGS = 0.25                  # Only swap in a lossless re-encode that saves at least 25%
+HEAVY_PNG_BYTES_PER_PIXEL = 0.5     # Scans/photos saved as PNG; worth trying JPEG
+
+
+@dataclass
+class FittedPayload:
+    """
+    The bytes to send to Textract plus what was done to get them.
+    """
+    data: bytes
+    format: str
+    width: int = None
+    height: int = None
+    original_bytes: int = 0
+    actions: list = field(default_factory=list)
+
+    @property
+    def bytes_saved(self):
+        return self.original_bytes - len(self.data)
+
+    def describe(self):
+        if not self.actions:
+            return f"{self.format} payload sent as-is ({len(self.data):,} bytes)"
+        return (f"{', '.join(self.actions)}: {self.original_bytes:,} -> {len(self.data):,} bytes "
+                f"({self.bytes_saved:,} saved)")
+
+
+# --- Local Format / Dimension Sniffing ---
+def sniff_image(data):
+    """
+    Returns (format, width, height) from the file header without decoding
+    the image. Width/height are None for PDF, TIFF and unknown formats.
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and data[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", data[16:24])
+        return "png", width, height
+
+    if data.startswith(b"\xff\xd8"):
+        return ("jpeg",) + _jpeg_size(data)
+
+    if data.startswith(b"%PDF"):
+        return "pdf", None, None
+    if data[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff", None, None
+    return "unknown", None, None
+
+
+def _jpeg_size(data):
+    # Walk the marker segments until a start-of-frame (SOFn) marker
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            pos += 1
+            continue
+        marker = data[pos + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            pos += 1 if marker == 0xFF else 2
+            continue
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None, None
+
+
+# --- Re-encoding (needs Pillow) ---
+def _encode(image, image_format, quality):
+    buffer = io.BytesIO()
+    if image_format == "jpeg":
+        if image.mode not in ("RGB", "L"):
+            # Flatten transparency onto white before dropping the alpha channel
+            from PIL import Image
+            background = Image.new("RGB", image.size, "white")
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+    else:
+        image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def fit_payload(data, max_bytes=MAX_SYNC_BYTES, max_dimension=MAX_DIMENSION,
+                min_long_edge=MIN_LONG_EDGE, max_long_edge=None,
+                jpeg_quality=JPEG_QUALITY, min_savings=MIN_SAVINGS):
+    """
+    Makes a PNG/JPEG payload fit the synchronous API limits, changing it
+    as little as possible.
+
+    A payload within the limits is sent as-is. The one exception is a
+    heavy PNG (a scan or photo), which is re-encoded losslessly and only
+    swapped in when the measured saving is at least ``min_savings``.
+
+    Images over ``max_bytes`` or ``max_dimension`` (or the optional
+    ``max_long_edge``) are re-encoded (PNG or JPEG at ``jpeg_quality``)
+    and shrunk step by step until they fit. Any re-encoded image is first
+    turned upright from its EXIF orientation, as the new file drops the
+    tag. The smallest candidate that fits wins, but no image is ever
+    scaled below ``min_long_edge`` pixels. PDF/TIFF, unknown formats and
+    images whose header gives a zero size are passed through unchanged.
+
+    Raises ValueError if the payload cannot be made to fit.
+    """
+    image_format, width, height = sniff_image(data)
+    payload = FittedPayload(data, image_format, width, height, original_bytes=len(data))
+
+    # A zero width or height means a truncated or malformed header: pass it through like PDF/TIFF
+    if image_format not in ("png", "jpeg") or not (width and height):
+        if len(data) > max_bytes:
+            raise ValueError(f"{image_format} payload is {len(data):,} bytes; "
+                             f"the synchronous API accepts at most {max_bytes:,}")
+        return payload
+
+    cap = min(max_dimension, max_long_edge or max_dimension)
+    within_limits = len(data) <= max_bytes and max(width, height) <= cap
+
+    # Cheap exit without decoding: fits already and a lossless re-encode would not pay off
+    heavy = image_format == "png" and len(data) / (width * height) > HEAVY_PNG_BYTES_PER_PIXEL
+    if within_limits and not heavy:
+        return payload
+
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        if within_limits:
+            return payload
+        raise ValueError("Image exceeds the synchronous API limits and Pillow is not "
+                         "installed to downscale it: pip install Pillow") from None
+
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    # Re-encoding drops EXIF, so bake its orientation into the pixels first
+    image = ImageOps.exif_transpose(image)
+    width, height = image.size
+
+    if within_limits:
+        # Lossless only: a payload that already fits never loses detail
+        encoded = _encode(image, "png", jpeg_quality)
+        if len(encoded) > len(data) * (1 - min_savings):
+            return payload
+        return FittedPayload(encoded, "png", width, height, len(data), ["re-encoded png losslessly"])
+
+    long_edge = max(width, height)
+
+    # Light PNGs (text on flat backgrounds) try to stay lossless first
+    formats = ["png", "jpeg"] if image_format == "png" and not heavy else ["jpeg"]
+    floor_scale = min(1.0, min_long_edge / long_edge)
+    scale = min(1.0, cap / long_edge)
+    candidate_image = image
+
+    while True:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if candidate_image.size != size:
+            # Shrink the previous candidate rather than the full original: much cheaper
+            candidate_image = candidate_image.resize(size, Image.LANCZOS)
+
+        best = None
+        for candidate_format in formats:
+            encoded = _encode(candidate_image, candidate_format, jpeg_quality)
+            if best is None or len(encoded) < len(best[1]):
+                best = (candidate_format, encoded)
+            if len(best[1]) <= max_bytes:
+                break
+
+        if len(best[1]) <= max_bytes:
+            actions = []
+            if scale < 1.0:
+                actions.append(f"downscaled {width}x{height} -> {size[0]}x{size[1]}")
+            actions.append(f"re-encoded {image_format} -> {best[0]}")
+            return FittedPayload(best[1], best[0], size[0], size[1], len(data), actions)
+
+        if scale <= floor_scale:
+            break
+        # Encoded size tracks pixel count, so jump close to the target in one step
+        estimate = scale * (max_bytes / len(best[1])) ** 0.5 * 0.95
+        scale = max(floor_scale, min(scale * 0.8, estimate))
+
+    raise ValueError(f"Could not fit {width}x{height} {image_format} under {max_bytes:,} bytes "
+                     f"without going below {min_long_edge}px")
+
+
+def load_document(file_path, **limits):
+    """
+    Reads a local document and fits it to the sync API limits.
+    Returns a FittedPayload; ``.data`` is what to send as Document.Bytes.
+    """
+    with open(file_path, "rb") as document:
+        return fit_payload(document.read(), **limits)
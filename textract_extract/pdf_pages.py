@@ -0,0 +1,95 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from textract_extract.client import get_textract_client
+from textract_extract.metrics import METRICS
+from textract_extract.parsers import parse_lines
+from textract_extract.payload import MAX_SYNC_BYTES
+from textract_extract.retry import retrying
+
+DEFAULT_PAGE_WORKERS = 8
+
+
+# --- PDF Page Splitting ---
+def split_pdf_pages(pdf_bytes, max_bytes=MAX_SYNC_BYTES):
+    """
+    Splits a PDF into single-page PDF payloads, in page order.
+    Single-page PDFs are returned unchanged (no re-encoding).
+
+    The sync size limit applies to each page, not to the whole file:
+    raises ValueError if a page is over ``max_bytes``.
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        raise ImportError("Splitting multi-page PDFs requires pypdf: pip install pypdf") from None
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    if len(reader.pages) <= 1:
+        pages = [pdf_bytes]
+    else:
+        pages = []
+        for page in reader.pages:
+            writer = PdfWriter()
+            writer.add_page(page)
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            pages.append(buffer.getvalue())
+
+    for page_number, page in enumerate(pages, start=1):
+        if len(page) > max_bytes:
+            raise ValueError(f"PDF page {page_number} is {len(page):,} bytes; "
+                             f"the synchronous API accepts at most {max_bytes:,}")
+    return pages
+
+
+# --- Concurrent Per-Page DetectDocumentText ---
+def iter_pdf_lines(pdf_bytes, textract=None, max_workers=DEFAULT_PAGE_WORKERS):
+    """
+    Sends every page of a PDF to the synchronous DetectDocumentText API
+    concurrently and yields its lines as {'Page', 'Text'} dicts in page
+    order, so a long document takes roughly as long as its slowest page.
+    Page N's lines are yielded as soon as pages 1..N are back.
+    """
+    textract = textract or get_textract_client()
+    detect = retrying(METRICS.instrument_call(textract.detect_document_text, "DetectDocumentText", {}))
+    pages = split_pdf_pages(pdf_bytes)
+
+    def detect_page(page_bytes):
+        response = detect(Document={"Bytes": page_bytes})
+        return parse_lines(response["Blocks"])
+
+    if len(pages) == 1 or max_workers <= 1:
+        for page_number, page in enumerate(pages, start=1):
+            for text in detect_page(page):
+                yield {"Page": page_number, "Text": text}
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pages))) as executor:
+        # map() yields in submission (page) order
+        for page_number, lines in enumerate(executor.map(detect_page, pages), start=1):
+            for text in lines:
+                yield {"Page": page_number, "Text": text}
+
+
+def detect_pdf_lines(pdf_bytes, textract=None, max_workers=DEFAULT_PAGE_WORKERS):
+    """
+    Returns every line of a PDF as a list (see iter_pdf_lines).
+    """
+    return list(iter_pdf_lines(pdf_bytes, textract, max_workers))
+
+
+def format_pdf_lines(lines):
+    """
+    Renders detect_pdf_lines() output as text. Multi-page documents get a
+    '--- Page N ---' header before each page; single pages stay plain.
+    """
+    multi_page = any(line["Page"] > 1 for line in lines)
+    output = []
+    current_page = None
+    for line in lines:
+        if multi_page and line["Page"] != current_page:
+            current_page = line["Page"]
+            output.append(f"--- Page {current_page} ---")
+        output.append(line["Text"])
+    return "\n".join(output)
@@ -0,0 +1,195 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import defaultdict
+
+from textract_extract.metrics import METRICS
+
+DEFAULT_PROFILE_DIR = "profile"
+TOP_ALLOCATIONS = 25        # Lines listed per stage in <stage>.alloc.txt
+TOP_FUNCTIONS = 40          # Functions listed per stage in <stage>.txt
+
+_OWN_FILES = frozenset({tracemalloc.__file__, cProfile.__file__, __file__})
+
+
+class StageProfiler:
+    """
+    Profiles each pipeline stage (read, index, key_values, parse_tables,
+    tables, write) with cProfile and/or tracemalloc.
+
+    It plugs into the stage hooks metrics.py already places around every
+    stage, so nothing runs while profiling is off. Each thread gets its own
+    cProfile.Profile per stage; they are merged when the reports are
+    written. A stage that starts inside another stage on the same thread
+    is counted as part of the outer one.
+
+    Memory profiling turns tracemalloc on only while a stage runs and adds
+    up, per source line, the memory the stage allocated and still held
+    when it ended, plus each stage's peak. Tracing is process-wide, so in
+    this mode stages run one at a time (Textract calls, which are not
+    stages, still overlap) and each report only sees its own stage.
+    """
+
+    def __init__(self, cpu=True, memory=False):
+        self.cpu = cpu
+        self.memory = memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profiles = defaultdict(list)           # stage -> [cProfile.Profile per thread]
+        self._allocated = defaultdict(dict)          # stage -> {line: [bytes, blocks]}
+        self._peaks = {}                             # stage -> peak bytes above the stage's start
+        self._calls = defaultdict(int)
+        self._stage_lock = threading.Lock()          # Memory mode: one stage at a time
+
+    def start(self, name):
+        """
+        Begins profiling one run of stage ``name``; returns a token for stop().
+        """
+        local = self._local
+        if getattr(local, "active", None):
+            return None   # Nested stage: the outer stage already covers it
+        local.active = name
+
+        before = None
+        if self.memory:
+            # Trace only while the stage runs, so its snapshot holds just
+            # what the stage allocated and kept
+            self._stage_lock.acquire()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        # Enabled last so cProfile does not time the profiler's own work
+        profile = None
+        if self.cpu:
+            profiles = local.__dict__.setdefault("profiles", {})
+            profile = profiles.get(name)
+            if profile is None:
+                profile = profiles[name] = cProfile.Profile()
+                with self._lock:
+                    self._profiles[name].append(profile)
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None   # Another profiler owns this interpreter (3.12+); skip CPU for this run
+        return profile, before
+
+    def stop(self, name, token):
+        """
+        Ends the stage run started with ``token`` and accumulates its data.
+        """
+        if token is None:
+            return
+        profile, before = token
+        if profile is not None:
+            profile.disable()
+
+        if before is not None:
+            peak = tracemalloc.get_traced_memory()[1] - before
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+            tracemalloc.stop()
+            self._stage_lock.release()
+            with self._lock:
+                lines = self._allocated[name]
+                for stat in statistics:
+                    frame = stat.traceback[0]
+                    if frame.filename not in _OWN_FILES:   # Leave out the profilers' own bookkeeping
+                        entry = lines.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                        entry[0] += stat.size
+                        entry[1] += stat.count
+                self._peaks[name] = max(self._peaks.get(name, 0), peak)
+
+        with self._lock:
+            self._calls[name] += 1
+        self._local.active = None
+
+    def write(self, directory):
+        """
+        Writes <stage>.pstats and <stage>.txt (CPU) and <stage>.alloc.txt
+        (memory) for every profiled stage and returns the written paths.
+        """
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        with self._lock:
+            profiles = {name: list(items) for name, items in self._profiles.items()}
+            allocated = {name: dict(lines) for name, lines in self._allocated.items()}
+            peaks = dict(self._peaks)
+            calls = dict(self._calls)
+
+        for name, items in sorted(profiles.items()):
+            stats = _merge_stats(items)
+            if stats is None:
+                continue
+            pstats_path = os.path.join(directory, f"{name}.pstats")
+            stats.dump_stats(pstats_path)
+            report = io.StringIO()
+            report.write(f"Stage '{name}': {calls.get(name, 0)} runs\n\n")
+            pstats.Stats(pstats_path, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            written += [pstats_path, _write_text(directory, f"{name}.txt", report.getvalue())]
+
+        for name, lines in sorted(allocated.items()):
+            top = sorted(lines.items(), key=lambda item: item[1][0], reverse=True)[:TOP_ALLOCATIONS]
+            report = [f"Stage '{name}': {calls.get(name, 0)} runs, peak {peaks.get(name, 0) / 1024:.1f} KiB "
+                      f"allocated by a single run", "",
+                      f"{'KiB held':>12} {'blocks':>10}  line"]
+            report += [f"{size / 1024:12.1f} {count:10d}  {line}" for line, (size, count) in top]
+            written.append(_write_text(directory, f"{name}.alloc.txt", "\n".join(report) + "\n"))
+        return written
+
+
+
+def _merge_stats(profiles):
+    stats = None
+    for profile in profiles:
+        if stats is None:
+            stats = pstats.Stats(profile)
+        else:
+            stats.add(profile)
+    return stats
+
+
+def _write_text(directory, filename, text):
+    path = os.path.join(directory, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+# --- Command Line ---
+def add_profile_arguments(parser):
+    """
+    Adds the --profile/--profile-dir options to a script.
+    """
+    parser.add_argument("--profile", nargs="?", const="all", choices=("cpu", "memory", "all"),
+                        help="profile each stage with cProfile (cpu), tracemalloc (memory) or both (default)")
+    parser.add_argument("--profile-dir", help="where to write the per-stage reports "
+                                              "(default: a 'profile' folder next to the outputs)")
+
+
+def profiler_from_args(args):
+    """
+    Starts a StageProfiler for --profile and hooks it into the stages;
+    returns None without the option.
+    """
+    if not args.profile:
+        return None
+    profiler = StageProfiler(cpu=args.profile in ("cpu", "all"), memory=args.profile in ("memory", "all"))
+    METRICS.profiler = profiler
+    return profiler
+
+
+def write_profile_from_args(args, profiler, output_path=None):
+    """
+    Unhooks ``profiler`` and writes its reports to --profile-dir, or to a
+    'profile' folder next to ``output_path``.
+    """
+    if profiler is None:
+        return
+    METRICS.profiler = None
+    directory = args.profile_dir or os.path.join(os.path.dirname(output_path or ""), DEFAULT_PROFILE_DIR)
+    written = profiler.write(directory)
+    print(f"Profile reports ({len(written)} files) saved to {directory}", file=sys.stderr)
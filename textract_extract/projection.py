@@ -0,0 +1,133 @@
+import os
+
+from textract_extract.block_index import WORD_TYPES
+
+# Relationship types the parsers follow; MERGED_CELL, TABLE_TITLE, ... are dropped
+RELATIONSHIP_TYPES = ("CHILD", "VALUE", "ANSWER")
+BASE_KEYS = ("BlockType", "Id", "Page", "Confidence", "Text", "Relationships")
+TABLE_KEYS = ("EntityTypes", "TableType", "Title", "Footer", "RowIndex", "ColumnIndex", "RowSpan", "ColumnSpan")
+
+
+class Projection:
+    """
+    Keeps only the blocks and keys one extractor reads, so the rest of a
+    response (Geometry, Polygons, PAGE/LINE blocks a forms parser never
+    looks at, ...) can be freed before it is indexed.
+
+    ``block_types`` limits the blocks kept (None keeps all). Each kept
+    block holds only ``keys``, and its relationships only the
+    RELATIONSHIP_TYPES and the Ids of blocks that were kept. Blocks of
+    ``geometry_types`` also keep the ``geometry`` parts of their Geometry
+    (the BoundingBox by default).
+    """
+
+    def __init__(self, block_types=None, keys=BASE_KEYS, geometry_types=(), geometry=("BoundingBox",)):
+        self.block_types = frozenset(block_types) if block_types is not None else None
+        self.keys = tuple(keys)
+        self.geometry_types = frozenset(geometry_types)
+        self.geometry = tuple(geometry)
+
+    def with_geometry(self, block_types, geometry=None):
+        """
+        Returns a copy that also keeps the Geometry of ``block_types``.
+        """
+        return Projection(self.block_types, self.keys, self.geometry_types | set(block_types),
+                          geometry or self.geometry)
+
+    def blocks(self, blocks):
+        """
+        Returns the projected copy of a Blocks list (the input is not changed).
+        """
+        block_types, keep = self.block_types, frozenset(self.keys)
+        if block_types is not None:
+            blocks = [block for block in blocks if block["BlockType"] in block_types]
+        # Ids of dropped blocks are pruned so the indexes never see dangling children
+        kept_ids = None if block_types is None else {block["Id"] for block in blocks}
+
+        projected = []
+        for block in blocks:
+            copy = {key: value for key, value in block.items() if key in keep}
+            relationships = copy.get("Relationships")
+            if relationships and not _followed(relationships, kept_ids):
+                copy["Relationships"] = [
+                    {"Type": rel["Type"], "Ids": rel["Ids"] if kept_ids is None
+                     else [i for i in rel["Ids"] if i in kept_ids]}
+                    for rel in relationships if rel["Type"] in RELATIONSHIP_TYPES
+                ]
+            if block["BlockType"] in self.geometry_types and "Geometry" in block:
+                geometry = block["Geometry"]
+                copy["Geometry"] = {part: geometry[part] for part in self.geometry if part in geometry}
+            projected.append(copy)
+        return projected
+
+    def apply(self, response):
+        """
+        Returns a copy of a Textract response with projected Blocks. For
+        AnalyzeExpense the blocks inside each ExpenseDocument are projected
+        and the fields lose their Geometry.
+        """
+        projected = {key: value for key, value in response.items() if key not in ("Blocks", "ExpenseDocuments")}
+        if "Blocks" in response:
+            projected["Blocks"] = self.blocks(response["Blocks"])
+        if "ExpenseDocuments" in response:
+            projected["ExpenseDocuments"] = [
+                dict(document,
+                     Blocks=self.blocks(document.get("Blocks", ())),
+                     SummaryFields=[_strip_geometry(field) for field in document.get("SummaryFields", ())],
+                     LineItemGroups=[
+                         dict(group, LineItems=[
+                             dict(item, LineItemExpenseFields=[
+                                 _strip_geometry(field) for field in item.get("LineItemExpenseFields", ())
+                             ])
+                             for item in group.get("LineItems", ())
+                         ])
+                         for group in document.get("LineItemGroups", ())
+                     ])
+                for document in response["ExpenseDocuments"]
+            ]
+        return projected
+
+
+def _followed(relationships, kept_ids):
+    # True when a block's relationships can be kept as they are: every type
+    # is followed and every target was kept (the usual case, and no copy)
+    for rel in relationships:
+        if rel["Type"] not in RELATIONSHIP_TYPES or (kept_ids is not None and not kept_ids.issuperset(rel["Ids"])):
+            return False
+    return True
+
+
+def _strip_geometry(field):
+    # An expense field's detections without their Geometry
+    return {
+        key: {k: v for k, v in value.items() if k != "Geometry"} if key.endswith("Detection") else value
+        for key, value in field.items()
+    }
+
+
+# --- Per-Extractor Projections ---
+# Extractor (script / CLI operation name) -> what its parser reads
+PROJECTIONS = {
+    "lines": Projection({"LINE"}, keys=("BlockType", "Id", "Page", "Text", "Confidence")),
+    "forms": Projection({"KEY_VALUE_SET", *WORD_TYPES}, keys=BASE_KEYS + ("EntityTypes",)),
+    "queries": Projection({"QUERY", "QUERY_RESULT"}, keys=BASE_KEYS + ("Query",)),
+    "tables": Projection({"TABLE", "CELL", *WORD_TYPES}, keys=BASE_KEYS + TABLE_KEYS),
+    "invoice": Projection({"KEY_VALUE_SET", "TABLE", "CELL", *WORD_TYPES}, keys=BASE_KEYS + TABLE_KEYS),
+    "expense": Projection(()),
+}
+
+
+def projection_for(extractor):
+    """
+    Returns the projection for ``extractor`` (a PROJECTIONS key), with
+    the BoundingBox kept for the block types in TEXTRACT_GEOMETRY_TYPES
+    (e.g. "LINE,WORD"). Returns None, keeping whole responses, when
+    TEXTRACT_PROJECTION is "off".
+    """
+    if os.getenv("TEXTRACT_PROJECTION", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    projection = PROJECTIONS[extractor]
+    geometry_types = os.getenv("TEXTRACT_GEOMETRY_TYPES")
+    if geometry_types:
+        projection = projection.with_geometry(t.strip() for t in geometry_types.split(",") if t.strip())
+    return projection
@@ -0,0 +1,64 @@
+import json
+import os
+
+MAX_QUERIES = 15   # Queries per synchronous AnalyzeDocument request
+
+# Document type -> {alias: question}. The alias becomes the "key" of each
+# answer, so a query set yields the same few keys on every document.
+DOCUMENT_QUERIES = {
+    "form": {
+        "NAME": "What is the name?",
+        "ID": "What is the ID number?",
+        "DATE": "What is the date?",
+        "ADDRESS": "What is the address?",
+        "PHONE": "What is the phone number?",
+    },
+    "invoice": {
+        "INVOICE_NUMBER": "What is the invoice number?",
+        "INVOICE_DATE": "What is the invoice date?",
+        "DUE_DATE": "When is the invoice due?",
+        "VENDOR": "Who is the vendor?",
+        "TOTAL": "What is the total amount due?",
+    },
+}
+
+
+def load_query_sets(path=None):
+    """
+    Returns the query sets: the built-in DOCUMENT_QUERIES plus those in a
+    JSON file (``path``, else TEXTRACT_QUERIES_FILE when set), which add
+    document types or replace built-in ones. The file maps each type to
+    {"ALIAS": "question", ...} or to a plain list of questions.
+    """
+    query_sets = dict(DOCUMENT_QUERIES)
+    path = path or os.getenv("TEXTRACT_QUERIES_FILE")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            query_sets.update(json.load(f))
+    return query_sets
+
+
+def build_queries(questions):
+    """
+    Turns {alias: question} or [question, ...] into the ``Queries`` list of
+    a QueriesConfig.
+    """
+    if isinstance(questions, dict):
+        queries = [{"Text": text, "Alias": alias} for alias, text in questions.items()]
+    else:
+        queries = [{"Text": text} for text in questions]
+    if not queries:
+        raise ValueError("a query set needs at least one question")
+    if len(queries) > MAX_QUERIES:
+        raise ValueError(f"{len(queries)} queries given; a synchronous request takes at most {MAX_QUERIES}")
+    return queries
+
+
+def queries_for(document_type, path=None):
+    """
+    Returns the ``Queries`` list for ``document_type`` (see load_query_sets).
+    """
+    query_sets = load_query_sets(path)
+    if document_type not in query_sets:
+        raise ValueError(f"no queries for '{document_type}' (choose from {', '.join(sorted(query_sets))})")
+    return build_queries(query_sets[document_type])
@@ -0,0 +1,234 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_EXPECTED_ITEMS = 1_000_000   # Bloom filter sizing floor (~1.2 MB of bits at 1%)
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+HASH_CHUNK_BYTES = 1024 * 1024
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+# --- Bloom Filter ---
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings: "no" answers are certain, "yes"
+    answers are wrong with probability ``false_positive_rate`` once
+    ``expected_items`` keys are in. The bit positions come from one
+    BLAKE2b digest split into two halves (double hashing).
+    """
+
+    def __init__(self, expected_items=DEFAULT_EXPECTED_ITEMS, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE):
+        expected_items = max(1, expected_items)
+        self.size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# --- Run Manifest ---
+class RunManifest:
+    """
+    Persistent record of a batch's inputs, so an interrupted run can be
+    restarted without redoing finished work.
+
+    One SQLite row per (path, operation) holds the input's size, mtime,
+    SHA-256, status ("done" / "failed"), output location and error. An
+    input is skipped when its row is "done" and the file is unchanged:
+    same size and mtime, or, if only the mtime moved, the same content
+    hash. Failed, changed and new inputs run again.
+
+    Every completed key is also added to an in-memory Bloom filter, checked
+    before the database: inputs never completed (new files, most of a
+    fresh corpus) are answered without a query. Rows are committed as they
+    are recorded (WAL journal), so a crash loses at most the documents in
+    flight. When the outputs go to a JsonLinesWriter, follow() it: "done"
+    rows then wait for the writer's next fsync, so the manifest never
+    claims a document whose record could still be lost. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path, expected_items=DEFAULT_EXPECTED_ITEMS):
+        self.path = path
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._writer = None
+        self._unsynced = []   # "done" rows waiting for the followed writer's fsync
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS inputs ("
+            " path TEXT NOT NULL, operation TEXT NOT NULL, size INTEGER, mtime_ns INTEGER, sha256 TEXT,"
+            " status TEXT NOT NULL, output TEXT, error TEXT, updated REAL,"
+            " PRIMARY KEY (path, operation))"
+        )
+        self._db.commit()
+
+        done = self._db.execute("SELECT COUNT(*) FROM inputs WHERE status = ?", (STATUS_DONE,)).fetchone()[0]
+        self._done = BloomFilter(max(expected_items, 2 * done))
+        for input_path, operation in self._db.execute(
+                "SELECT path, operation FROM inputs WHERE status = ?", (STATUS_DONE,)):
+            self._done.add(_key(input_path, operation))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def follow(self, writer):
+        """
+        Defers "done" rows until ``writer`` (a JsonLinesWriter holding the
+        outputs) has synced the records written before them.
+        """
+        self._writer = writer
+        writer.add_sync_callback(self._commit_unsynced)
+
+    def _commit_unsynced(self):
+        with self._lock:
+            rows, self._unsynced = self._unsynced, []
+            if rows:
+                self._db.executemany("INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.commit()
+        for row in rows:
+            self._done.add(_key(row[0], row[1]))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.flush()   # Commits the rows still waiting for a sync
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def is_done(self, path, operation):
+        """
+        True when ``path`` was completed for ``operation`` and has not
+        changed since.
+        """
+        path = os.path.abspath(path)
+        if _key(path, operation) not in self._done:
+            return False   # Certain: never completed
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, sha256, status FROM inputs WHERE path = ? AND operation = ?",
+                (path, operation),
+            ).fetchone()
+        if row is None or row[3] != STATUS_DONE:
+            return False   # A Bloom false positive, or a failed input
+        size, mtime_ns, sha256, _ = row
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            return True
+        # Touched but maybe not changed: compare the content, and remember the new mtime
+        if file_sha256(path) != sha256:
+            return False
+        with self._lock:
+            self._db.execute("UPDATE inputs SET mtime_ns = ? WHERE path = ? AND operation = ?",
+                             (stat.st_mtime_ns, path, operation))
+            self._db.commit()
+        return True
+
+    def pending(self, jobs):
+        """
+        Yields the (path, operation) jobs that still need to run, lazily,
+        counting the others in ``skipped``.
+        """
+        for job in jobs:
+            if self.is_done(*job):
+                self.skipped += 1
+            else:
+                yield job
+
+    def record(self, path, operation, output=None, error=None):
+        """
+        Stores one input's outcome: "done" with its output location, or
+        "failed" with the error when ``error`` is given.
+        """
+        path = os.path.abspath(path)
+        status = STATUS_FAILED if error is not None else STATUS_DONE
+        try:
+            stat = os.stat(path)
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            sha256 = file_sha256(path) if status == STATUS_DONE else None
+        except OSError:
+            size = mtime_ns = sha256 = None
+        row = (path, operation, size, mtime_ns, sha256, status, output,
+               None if error is None else str(error), time.time())
+        with self._lock:
+            if status == STATUS_DONE and self._writer is not None:
+                self._unsynced.append(row)
+                return
+            self._db.execute("INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._db.commit()
+        if status == STATUS_DONE:
+            self._done.add(_key(path, operation))
+
+    def summary(self):
+        """
+        Returns {status: count} over every recorded input.
+        """
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM inputs GROUP BY status"))
+
+
+def _key(path, operation):
+    return f"{operation}\0{path}"
+
+
+# --- Shared Command-Line Options ---
+def add_resume_arguments(parser):
+    """
+    Adds the --resume option to a batch command.
+    """
+    parser.add_argument("--resume", metavar="MANIFEST",
+                        help="skip inputs this SQLite manifest records as done and unchanged; "
+                             "record every result in it (created if missing)")
+
+
+def manifest_from_args(args, writer=None):
+    """
+    Returns a RunManifest for --resume, or None without it. With the
+    JsonLinesWriter of --jsonl, the manifest follows it (see follow()).
+    """
+    if not args.resume:
+        return None
+    run_manifest = RunManifest(args.resume)
+    if writer is not None:
+        run_manifest.follow(writer)
+    return run_manifest
@@ -0,0 +1,304 @@
+import functools
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+from textract_extract.metrics import METRICS
+
+# --- Retry Defaults ---
+MAX_ATTEMPTS = 5            # Total attempts per call, including the first one
+MAX_DELAY = 20.0            # Seconds; cap of the decorrelated-jitter backoff
+BASE_DELAYS = {             # First backoff per error kind; throttles back off harder
+    "throttle": 0.5,
+    "server": 0.1,
+    "network": 0.1,
+}
+RETRY_BUDGET_RATIO = 0.1    # Each call earns 0.1 retries: retries stay under ~10% of traffic
+RETRY_BUDGET_RESERVE = 20   # Retries that may be spent before any have been earned
+BREAKER_WINDOW = 50         # Recent calls the circuit breaker looks at
+BREAKER_MIN_CALLS = 20      # ... and how many it needs before it may open
+BREAKER_THRESHOLD = 0.5     # Failure rate that opens the breaker
+BREAKER_COOLDOWN = 5.0      # Seconds dispatch stays paused before a probe call
+
+# Error codes that mean "slow down" rather than "broken"
+THROTTLING_CODES = frozenset({
+    "ThrottlingException",
+    "ProvisionedThroughputExceededException",
+    "LimitExceededException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "SlowDown",
+})
+SERVER_ERROR_CODES = frozenset({"InternalServerError", "ServiceUnavailable", "ServiceUnavailableException"})
+
+# Error kinds returned by classify_error
+THROTTLE, SERVER, NETWORK, CLIENT = "throttle", "server", "network", "client"
+
+
+def classify_error(error):
+    """
+    Sorts an exception from a Textract call into THROTTLE, SERVER, NETWORK
+    or CLIENT. Only CLIENT errors (bad document, bad credentials, ...) are
+    never retried.
+    """
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code", "")
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        if code in THROTTLING_CODES or status == 429:
+            return THROTTLE
+        if code in SERVER_ERROR_CODES or status >= 500:
+            return SERVER
+        return CLIENT
+
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return NETWORK
+    # botocore is already imported if it raised; no need to load it here
+    exceptions = sys.modules.get("botocore.exceptions")
+    if exceptions is not None and isinstance(error, (exceptions.ConnectionError, exceptions.HTTPClientError)):
+        return NETWORK
+    return CLIENT
+
+
+# --- Retry Budget ---
+class RetryBudget:
+    """
+    Token bucket that limits retries to a fraction of all calls.
+
+    Every call deposits ``ratio`` tokens (up to ``reserve``) and every retry
+    spends one, so when Textract is overloaded retries cannot multiply the
+    load it sees.
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, reserve=RETRY_BUDGET_RESERVE):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = float(reserve)
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def try_spend(self):
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+# --- Circuit Breaker ---
+class CircuitBreaker:
+    """
+    Pauses dispatch while Textract is failing.
+
+    The breaker opens when at least ``threshold`` of the last ``window``
+    calls failed with a throttle, 5xx or network error. While open,
+    ``acquire()`` blocks every caller; after ``cooldown`` seconds a single
+    probe call is let through. If the probe succeeds the breaker closes,
+    otherwise it opens again.
+
+    ``acquire()`` returns a token to pass back to ``record()``: the
+    breaker's generation, which moves on with every state change. Only
+    outcomes of the current generation count, so a call still in flight
+    from before the breaker opened can never close or reopen it; while
+    half-open, only the probe decides.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._generation = 0
+        self._probing = False
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Returns a token when a call may be dispatched, waiting while the
+        breaker is open.
+        """
+        while True:
+            with self._lock:
+                if self.state == self.CLOSED:
+                    return self._generation
+                wait = self._opened_at + self.cooldown - self._clock()
+                if self.state == self.OPEN and wait <= 0:
+                    self._set_state(self.HALF_OPEN)
+                if self.state == self.HALF_OPEN and not self._probing:
+                    self._probing = True
+                    return self._generation
+            self._sleep(max(wait, 0.05))
+
+    def record(self, failed, token=None):
+        """
+        Records the outcome of the call that acquired ``token``. Outcomes
+        of an earlier generation are ignored; without a token, a call
+        only counts while the breaker is closed.
+        """
+        with self._lock:
+            if token is not None and token != self._generation:
+                return   # Dispatched before the last state change
+            if self.state == self.HALF_OPEN:
+                if token is None or not self._probing:
+                    return
+                self._probing = False
+                if failed:
+                    self._open()
+                else:
+                    self._set_state(self.CLOSED)
+                return
+            if self.state != self.CLOSED:
+                return
+            if len(self._outcomes) == self._outcomes.maxlen:
+                self._failures -= self._outcomes[0]
+            self._outcomes.append(failed)
+            self._failures += failed
+            if len(self._outcomes) >= self.min_calls and self._failures >= self.threshold * len(self._outcomes):
+                self._open()
+
+    def release(self, token):
+        """
+        Gives up ``token`` without an outcome (the call was interrupted),
+        so another caller can probe a half-open breaker.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and token == self._generation:
+                self._probing = False
+
+    def _open(self):
+        self._set_state(self.OPEN)
+        self.opened += 1
+        self._opened_at = self._clock()
+
+    def _set_state(self, state):
+        self.state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._failures = 0
+
+
+# --- Retry Policy ---
+class RetryPolicy:
+    """
+    Retries Textract calls with decorrelated-jitter backoff.
+
+    Throttles, 5xx and network errors are retried up to ``max_attempts``
+    times while the shared RetryBudget allows it; client errors are raised
+    at once. Every attempt first passes the CircuitBreaker. ``stats``
+    counts calls, retries and errors by kind.
+    """
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, budget=None, breaker=None,
+                 base_delays=None, max_delay=MAX_DELAY, sleep=time.sleep, seed=None):
+        self.max_attempts = max_attempts
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.base_delays = {**BASE_DELAYS, **(base_delays or {})}
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "budget_exhausted": 0,
+                      THROTTLE: 0, SERVER: 0, NETWORK: 0, CLIENT: 0}
+
+    def next_delay(self, kind, previous=0.0):
+        """
+        Decorrelated jitter: uniform(base, 3 * previous delay), capped.
+        """
+        base = self.base_delays.get(kind, BASE_DELAYS[SERVER])
+        return min(self.max_delay, self._random.uniform(base, max(base, previous * 3)))
+
+    def call(self, function, *args, **kwargs):
+        self.budget.record_call()
+        self._count("calls")
+        delay = 0.0
+        for attempt in range(1, self.max_attempts + 1):
+            token = self.breaker.acquire()
+            recorded = False
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                kind = classify_error(e)
+                self._count(kind)
+                self.breaker.record(kind != CLIENT, token)
+                recorded = True
+                if kind == CLIENT or attempt == self.max_attempts:
+                    raise
+                if not self.budget.try_spend():
+                    self._count("budget_exhausted")
+                    raise
+                self._count("retries")
+                delay = self.next_delay(kind, delay)
+                self._sleep(delay)
+            else:
+                self.breaker.record(False, token)
+                recorded = True
+                return result
+            finally:
+                if not recorded:
+                    # KeyboardInterrupt, CancelledError, ...: free the probe slot
+                    self.breaker.release(token)
+
+    def wrap(self, function):
+        """
+        Returns ``function`` with this policy applied to every call.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return self.call(function, *args, **kwargs)
+        return wrapper
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        METRICS.inc("textract_retry_events_total", event=name)
+
+
+# --- Process-Wide Policy ---
+_policy = None
+_policy_lock = threading.Lock()
+
+
+def get_retry_policy():
+    """
+    Returns the policy shared by every Textract call in this process, so
+    one retry budget and one circuit breaker cover all threads.
+    """
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = RetryPolicy()
+    return _policy
+
+
+def set_retry_policy(policy):
+    """
+    Replaces the shared policy (e.g. with different limits, or with
+    ``RetryPolicy(max_attempts=1)`` to turn retries off).
+    """
+    global _policy
+    with _policy_lock:
+        _policy = policy
+
+
+def retrying(function):
+    """
+    Wraps a Textract client method with the shared retry policy.
+    """
+    return get_retry_policy().wrap(function)
@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from textract_extract.cache import ResponseCache
+from textract_extract.client import MAX_POOL_CONNECTIONS, get_textract_client
+from textract_extract.forms import iter_key_values
+from textract_extract.invoice import extract_invoice
+from textract_extract.lines import iter_lines
+from textract_extract.metrics import METRICS
+from textract_extract.tables import iter_tables
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_WORKERS = 8
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_QUEUE_TIMEOUT = 10.0
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+
+
+# --- Operations (same JSON shapes as the scripts' output files) ---
+def _lines(doc, textract, cache):
+    # [{"Page", "Text"}, ...]; pages run in turn, the service pool supplies the concurrency
+    return list(iter_lines(doc, textract, cache, max_workers=1))
+
+
+def _forms(doc, textract, cache):
+    # [{"key", "value", "confidence"}, ...]
+    return list(iter_key_values(doc, textract, cache))
+
+
+def _expense(doc, textract, cache):
+    # output4.json from AnalyzeExpense
+    return extract_invoice(doc, textract, cache, mode="expense")
+
+
+def _tables(doc, textract, cache):
+    # output5.json: [{"TableNumber", "Type", "Title", "Footer", "Columns", "Cells"}, ...]
+    return list(iter_tables(doc, textract, cache))
+
+
+# URL path (/lines, /forms, ...) -> function(document_bytes, textract, cache) -> JSON body
+OPERATIONS = {
+    "lines": _lines,
+    "forms": _forms,
+    "invoice": extract_invoice,   # output4.json: {"extracted_data", "needs_review", "line_items"}
+    "expense": _expense,
+    "tables": _tables,
+}
+
+
+class QueueFull(Exception):
+    """Raised when the service already holds as many documents as it may queue."""
+
+
+# --- Warm Extraction Service ---
+class ExtractionService:
+    """
+    Runs extraction requests on a fixed worker pool with one warm client.
+
+    At most ``max_workers`` documents are sent to Textract at once and at
+    most ``queue_size`` more wait for a worker; beyond that ``submit``
+    waits up to ``queue_timeout`` seconds for room and then raises
+    QueueFull so callers can back off.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT, textract=None, cache=None):
+        # Building the client up front loads botocore's service model and
+        # opens the connection pool before the first document arrives
+        self.textract = textract or get_textract_client(
+            max_pool_connections=max(max_workers, MAX_POOL_CONNECTIONS))
+        self.cache = cache
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="textract")
+        self._lock = threading.Lock()
+        self.stats = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "pending": 0}
+
+    def submit(self, operation, document_bytes):
+        """
+        Queues one document and returns a Future for its JSON result.
+        """
+        if operation not in OPERATIONS:
+            raise KeyError(operation)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._count("rejected")
+            raise QueueFull(f"{self.max_workers + self.queue_size} documents already queued")
+
+        self._count("accepted", pending=1)
+        try:
+            future = self._executor.submit(OPERATIONS[operation], document_bytes, self.textract, self.cache)
+        except BaseException:
+            self._release(failed=True)
+            raise
+        future.add_done_callback(lambda f: self._release(failed=f.exception() is not None))
+        return future
+
+    def run(self, operation, document_bytes):
+        """
+        Runs one document through the queue and returns its result.
+        """
+        return self.submit(operation, document_bytes).result()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, workers=self.max_workers, queue_size=self.queue_size)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def _count(self, name, pending=0):
+        with self._lock:
+            self.stats[name] += 1
+            self.stats["pending"] += pending
+
+    def _release(self, failed):
+        self._count("failed" if failed else "completed", pending=-1)
+        self._slots.release()
+
+
+# --- HTTP Front End ---
+def _make_handler(service):
+    class ExtractionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path.rstrip("/") in ("", "/health"):
+                self._reply(200, {"status": "ok", "operations": list(OPERATIONS), **service.snapshot()})
+            elif self.path.rstrip("/") == "/metrics":
+                payload = METRICS.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            else:
+                self._reply(404, {"error": f"unknown path '{self.path}'"})
+
+        def do_POST(self):
+            # POST /<operation> with the raw document bytes as the body
+            operation = self.path.strip("/").split("?", 1)[0]
+            if operation not in OPERATIONS:
+                self._drain()
+                self._reply(404, {"error": f"unknown operation '{operation}'", "operations": list(OPERATIONS)})
+                return
+
+            length = self._content_length()
+            if length is None:
+                # Without a usable length the body cannot be skipped either
+                self.close_connection = True
+                if "Content-Length" in self.headers:
+                    self._reply(400, {"error": "Content-Length must be a non-negative integer"})
+                else:
+                    self._reply(411, {"error": "Content-Length is required; POST the document bytes"})
+                return
+            if length > MAX_UPLOAD_BYTES:
+                self.close_connection = True
+                self._reply(413, {"error": f"document is larger than {MAX_UPLOAD_BYTES} bytes"})
+                return
+            if length <= 0:
+                self._reply(400, {"error": "empty request body; POST the document bytes"})
+                return
+            document_bytes = self.rfile.read(length)
+
+            try:
+                body = service.run(operation, document_bytes)
+            except QueueFull as e:
+                self._reply(503, {"error": str(e)}, {"Retry-After": "1"})
+            except ValueError as e:
+                # Unreadable or oversized document (see payload.py)
+                self._reply(400, {"error": str(e)})
+            except Exception as e:
+                self._reply(502, {"error": f"{type(e).__name__}: {e}"})
+            else:
+                self._reply(200, body)
+
+        def _content_length(self):
+            # None when the header is missing or not a plain non-negative integer
+            value = self.headers.get("Content-Length")
+            if value is None or not value.strip().isdecimal():
+                return None
+            return int(value)
+
+        def _drain(self):
+            length = self._content_length()
+            if length is not None and 0 < length <= MAX_UPLOAD_BYTES:
+                self.rfile.read(length)
+            elif length != 0:
+                self.close_connection = True
+
+        def _reply(self, status, body, headers=None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def address_string(self):
+            # Unix socket peers have no (host, port) address
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def log_message(self, format, *args):
+            pass   # Keep the service quiet; /health and /metrics carry the counters
+
+    return ExtractionHandler
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def start_server(service, host=DEFAULT_HOST, port=0, socket_path=None):
+    """
+    Starts the HTTP front end for ``service`` on a background thread and
+    returns the server (``server.url`` is set for TCP servers). Pass
+    ``socket_path`` to listen on a Unix socket instead of host/port.
+    Call ``server.shutdown()`` when done.
+    """
+    server = _create_server(service, host, port, socket_path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _create_server(service, host, port, socket_path):
+    handler = _make_handler(service)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)   # Stale socket from an earlier run
+        server = _UnixHTTPServer(socket_path, handler)
+        server.url = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        server.url = f"http://{host}:{server.server_address[1]}"
+    server.service = service
+    return server
+
+
+# --- Command Line ---
+def add_server_arguments(parser):
+    """
+    Adds the daemon options (listen address, workers, queue) to a parser.
+    """
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of --host/--port")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent Textract calls")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="documents that may wait for a worker")
+    parser.add_argument("--queue-timeout", type=float, default=DEFAULT_QUEUE_TIMEOUT,
+                        help="seconds to wait for queue room before answering 503")
+
+
+def serve_from_args(args):
+    """
+    Runs the service in the foreground until Ctrl+C or SIGTERM.
+    """
+    # A long-running service is always instrumented; GET /metrics exposes it
+    METRICS.enable()
+    service = ExtractionService(
+        max_workers=args.workers,
+        queue_size=args.queue_size,
+        queue_timeout=args.queue_timeout,
+        cache=ResponseCache.from_env(),
+    )
+    server = _create_server(service, args.host, args.port, args.socket)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Textract extraction service listening on {server.url} "
+          f"(operations: {', '.join(OPERATIONS)})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+        print(f"Stats: {service.snapshot()}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Textract extraction service with warm clients.")
+    add_server_arguments(parser)
+    return serve_from_args(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
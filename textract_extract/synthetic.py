@@ -0,0 +1,199 @@
+import random
+import uuid
+
+# Vocabulary for realistic-looking forms and invoice tables
+FORM_KEYS = [
+    "Name:", "Date:", "Address:", "City:", "State:", "Zip Code:", "Phone:", "Email:",
+    "Account No.", "Invoice No.", "Due Date:", "PO Number:", "Signature:", "Total",
+]
+FORM_VALUES = [
+    "John Doe", "10/26/2023", "123 Test Lane", "Springfield", "CA", "90210",
+    "(555) 010-0199", "john@example.com", "04USDLR023400545064", "0000354", "$900.00",
+]
+TABLE_HEADERS = ["Description", "Qty", "Unit Price", "Tax", "Line Total"]
+# AnalyzeExpense summary fields: (Type, printed label or None, sample values)
+EXPENSE_SUMMARY_FIELDS = [
+    ("INVOICE_RECEIPT_ID", "Invoice No.", ["0000354", "INV-2023-118"]),
+    ("INVOICE_RECEIPT_DATE", "Date:", ["10/26/2023", "01/01/2019"]),
+    ("DUE_DATE", "Due Date:", ["11/25/2023", "02/01/2019"]),
+    ("PO_NUMBER", "PO Number:", ["PO-7781", "4500012345"]),
+    ("VENDOR_NAME", None, ["Acme Supplies Ltd", "Springfield Services"]),
+    ("RECEIVER_NAME", "BILLED TO", ["John Doe", "Jon Smith"]),
+    ("SUBTOTAL", "Subtotal", ["$800.00", "$1,250.00"]),
+    ("TAX", "Tax", ["$64.00", "$100.00"]),
+    ("TOTAL", "Total", ["$864.00", "$1,350.00"]),
+]
+WORDS = ["Lorem", "ipsum", "dolor", "sit", "amet", "invoice", "total", "item", "service", "fee"]
+
+
+class _Builder:
+    """
+    Accumulates blocks for one synthetic response.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.blocks = []
+
+    def new_id(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def geometry(self):
+        left, top = self.rng.random() * 0.8, self.rng.random() * 0.9
+        width, height = 0.05 + self.rng.random() * 0.15, 0.01 + self.rng.random() * 0.02
+        return {
+            "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+            "Polygon": [
+                {"X": left, "Y": top}, {"X": left + width, "Y": top},
+                {"X": left + width, "Y": top + height}, {"X": left, "Y": top + height},
+            ],
+        }
+
+    def add(self, block_type, page, **fields):
+        block = {
+            "BlockType": block_type,
+            "Confidence": round(self.rng.uniform(60.0, 99.9), 3),
+            "Geometry": self.geometry(),
+            "Id": self.new_id(),
+            "Page": page,
+        }
+        block.update(fields)
+        self.blocks.append(block)
+        return block
+
+    def words(self, text, page):
+        """
+        Adds one WORD block per token and returns the CHILD relationship.
+        """
+        ids = [self.add("WORD", page, Text=token, TextType="PRINTED")["Id"] for token in text.split()]
+        return [{"Type": "CHILD", "Ids": ids}] if ids else []
+
+
+def generate_response(pages=1, lines_per_page=40, kv_pairs=0, tables=0,
+                      rows=10, columns=len(TABLE_HEADERS), seed=0,
+                      operation="AnalyzeDocument", queries=()):
+    """
+    Generates a structurally realistic Textract response.
+
+    ``kv_pairs`` and ``tables`` are totals spread round-robin over the pages.
+    Each of ``queries`` (QueriesConfig dicts) gets a QUERY block on page 1,
+    most of them answered by a QUERY_RESULT.
+    Every block carries Geometry, Confidence and a UUID Id like the real
+    service, so memory and parse-time numbers are representative. The same
+    arguments and ``seed`` always produce the same response.
+    """
+    rng = random.Random(seed)
+    b = _Builder(rng)
+
+    for page in range(1, pages + 1):
+        page_block = b.add("PAGE", page, Relationships=[{"Type": "CHILD", "Ids": []}])
+        page_children = page_block["Relationships"][0]["Ids"]
+
+        for _ in range(lines_per_page):
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9)))
+            rel = b.words(text, page)
+            page_children.append(b.add("LINE", page, Text=text, Relationships=rel)["Id"])
+
+        # Key-value pairs for this page (KEY points at VALUE, both own WORDs)
+        for _ in range(page - 1, kv_pairs, pages):
+            value_rel = b.words(rng.choice(FORM_VALUES) if rng.random() > 0.1 else "", page)
+            value = b.add("KEY_VALUE_SET", page, EntityTypes=["VALUE"], Relationships=value_rel)
+            key_rel = b.words(rng.choice(FORM_KEYS), page)
+            b.add("KEY_VALUE_SET", page, EntityTypes=["KEY"],
+                  Relationships=[{"Type": "VALUE", "Ids": [value["Id"]]}] + key_rel)
+
+        # Tables for this page: header row + data rows
+        for _ in range(page - 1, tables, pages):
+            cell_ids = []
+            for row in range(1, rows + 1):
+                for col in range(1, columns + 1):
+                    if row == 1:
+                        text = TABLE_HEADERS[(col - 1) % len(TABLE_HEADERS)]
+                    elif col == 1:
+                        text = f"Item {row - 1} {rng.choice(WORDS)}"
+                    else:
+                        text = f"${rng.randint(1, 9999):,}.{rng.randint(0, 99):02d}"
+                    cell_rel = b.words(text, page)
+                    cell = b.add("CELL", page, RowIndex=row, ColumnIndex=col,
+                                 RowSpan=1, ColumnSpan=1, Relationships=cell_rel)
+                    cell_ids.append(cell["Id"])
+            b.add("TABLE", page, EntityTypes=["STRUCTURED_TABLE"],
+                  Relationships=[{"Type": "CHILD", "Ids": cell_ids}])
+
+    for query in queries:
+        answers = []
+        if rng.random() > 0.1:
+            answers.append(b.add("QUERY_RESULT", 1, Text=rng.choice(FORM_VALUES))["Id"])
+        # QUERY blocks carry no Geometry or Confidence, only the question
+        b.blocks.append({
+            "BlockType": "QUERY", "Id": b.new_id(), "Page": 1, "Query": dict(query),
+            "Relationships": [{"Type": "ANSWER", "Ids": answers}] if answers else [],
+        })
+
+    version_key = ("DetectDocumentTextModelVersion" if operation == "DetectDocumentText"
+                   else "AnalyzeDocumentModelVersion")
+    return {
+        "DocumentMetadata": {"Pages": pages},
+        "Blocks": b.blocks,
+        version_key: "1.0",
+    }
+
+
+def generate_expense_response(pages=1, line_items=10, lines_per_page=20, seed=0):
+    """
+    Generates a structurally realistic AnalyzeExpense response: one
+    ExpenseDocument with SummaryFields, a LineItemGroup of ``line_items``
+    rows (ITEM, QUANTITY, UNIT_PRICE, PRICE and EXPENSE_ROW fields) and
+    the LINE / WORD Blocks the service also returns.
+    """
+    rng = random.Random(seed)
+    b = _Builder(rng)
+
+    def detection(text):
+        return {"Text": text, "Geometry": b.geometry(), "Confidence": round(rng.uniform(60.0, 99.9), 3)}
+
+    def field(kind, label, value, page):
+        expense_field = {"Type": {"Text": kind, "Confidence": round(rng.uniform(80.0, 99.9), 3)}}
+        if label is not None:
+            expense_field["LabelDetection"] = detection(label)
+        expense_field["ValueDetection"] = detection(value)
+        expense_field["PageNumber"] = page
+        return expense_field
+
+    summary = [
+        field(kind, label, rng.choice(values), 1 + i % pages)
+        for i, (kind, label, values) in enumerate(EXPENSE_SUMMARY_FIELDS)
+    ]
+
+    items = []
+    for row in range(1, line_items + 1):
+        page = 1 + (row - 1) * pages // max(line_items, 1)
+        description = f"Item {row} {rng.choice(WORDS)}"
+        quantity = rng.randint(1, 20)
+        unit_price = rng.randint(1, 999)
+        price = f"${quantity * unit_price:,}.00"
+        items.append({"LineItemExpenseFields": [
+            field("ITEM", "Description", description, page),
+            field("QUANTITY", "Qty", str(quantity), page),
+            field("UNIT_PRICE", "Unit Price", f"${unit_price}.00", page),
+            field("PRICE", "Line Total", price, page),
+            field("EXPENSE_ROW", None, f"{description} {quantity} ${unit_price}.00 {price}", page),
+        ]})
+
+    for page in range(1, pages + 1):
+        page_block = b.add("PAGE", page, Relationships=[{"Type": "CHILD", "Ids": []}])
+        for _ in range(lines_per_page):
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9)))
+            rel = b.words(text, page)
+            page_block["Relationships"][0]["Ids"].append(b.add("LINE", page, Text=text, Relationships=rel)["Id"])
+
+    return {
+        "DocumentMetadata": {"Pages": pages},
+        "ExpenseDocuments": [{
+            "ExpenseIndex": 1,
+            "SummaryFields": summary,
+            "LineItemGroups": [{"LineItemGroupIndex": 1, "LineItems": items}],
+            "Blocks": b.blocks,
+        }],
+        "AnalyzeExpenseModelVersion": "1.0",
+    }
@@ -0,0 +1,97 @@
+import argparse
+import json
+
+from textract_extract.block_index import as_index
+from textract_extract.cache import ResponseCache
+from textract_extract.documents import get_blocks, read_bytes
+from textract_extract.jsonl import add_jsonl_arguments, writer_from_args
+from textract_extract.metrics import METRICS, add_metrics_arguments, metrics_from_args, write_metrics_from_args
+from textract_extract.parsers import iter_table_blocks
+from textract_extract.profiling import add_profile_arguments, profiler_from_args, write_profile_from_args
+from textract_extract.resume import add_resume_arguments, manifest_from_args
+from textract_extract.projection import projection_for
+
+
+# --- Lazy Table Extraction (script 5) ---
+def iter_tables(doc, textract=None, cache=None):
+    """
+    Yields a document's tables one at a time, in the output5.json
+    structure. ``doc`` may be a file path, raw bytes, an
+    AnalyzeDocument(TABLES) response or a BlockIndex.
+    """
+    blocks = as_index(get_blocks(doc, "AnalyzeDocument", textract, cache, projection_for("tables"),
+                                 FeatureTypes=["TABLES"]))
+    yield from METRICS.timed_iter("tables", iter_table_blocks(blocks))
+
+
+def extract_tables_local(file_path, output_file="output5.json", cache=None, writer=None, textract=None):
+    # Read the file (no S3 needed); it is fitted to the sync API limits only on a cache miss
+    document = read_bytes(file_path)
+
+    all_tables_data = []
+
+    # Analyze document for TABLES (served from the response cache on a hit)
+    for table in iter_tables(document, textract, cache):
+        print(f"\nTable {table['TableNumber']}:")
+        print(f"Type: {table['Type']}")
+        print(f"Title: {table['Title']}")
+        print(f"Footer: {table['Footer']}")
+
+        if writer is not None:
+            # Streaming mode: one JSON line per table, written as soon as it is parsed
+            writer.write({"Document": file_path, **table})
+        else:
+            all_tables_data.append(table)
+
+    if writer is not None:
+        print(f"\nExtracted table data streamed to {writer.path}")
+        return
+
+    # Save to output file
+    with METRICS.stage("write"), open(output_file, "w", encoding="utf-8") as f:
+        json.dump(all_tables_data, f, indent=4)
+
+    print(f"\nExtracted table data saved to {output_file}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract tables and metadata (TABLES).")
+    parser.add_argument("files", nargs="*", default=["table.png"], help="documents to analyze")
+    add_jsonl_arguments(parser)
+    add_resume_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics_from_args(args)
+    profiler = profiler_from_args(args)
+
+    if len(args.files) > 1 and not args.jsonl:
+        parser.error("several files need --jsonl (output5.json holds one document)")
+
+    writer = writer_from_args(args)
+    run_manifest = manifest_from_args(args, writer)
+    cache = ResponseCache.from_env()
+    failed = 0
+    try:
+        for file_path in args.files:
+            if run_manifest is not None and run_manifest.is_done(file_path, "tables"):
+                print(f"Skipping {file_path}: already done.")
+                continue
+            error = None
+            try:
+                extract_tables_local(file_path, cache=cache, writer=writer)
+            except Exception as e:
+                # Throttles and 5xx were already retried; move on to the next file
+                failed += 1
+                error = e
+                print(f"Error during Textract API call for {file_path}: {e}")
+            if run_manifest is not None:
+                run_manifest.record(file_path, "tables", args.jsonl or "output5.json", error)
+    finally:
+        if writer is not None:
+            writer.close()
+        if run_manifest is not None:
+            run_manifest.close()
+    write_metrics_from_args(args)
+    write_profile_from_args(args, profiler, args.jsonl or "output5.json")
+    return 1 if failed else 0